@@ -0,0 +1,4 @@
+"""
+Root pytest configuration
+Keeps the project root importable (``import src``) without sys.path hacks in tests
+"""
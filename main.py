@@ -16,6 +16,7 @@ from src.config import settings
 from src.api.main import create_app, start_server
 from src.watchers.video_watcher import VideoWatcher
 from src.utils.logger import setup_logger
+from src.utils.event_loop import install_fast_event_loop
 
 # Setup logger
 logger = setup_logger("main")
@@ -176,6 +177,7 @@ def run_cli():
 
 if __name__ == "__main__":
     print("Starting UGC Video Manager...")
+    install_fast_event_loop()
     try:
         # Check if running with arguments
         if len(sys.argv) > 1:
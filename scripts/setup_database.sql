@@ -60,6 +60,8 @@ CREATE INDEX idx_queue_priority ON upload_queue(priority DESC);
 CREATE INDEX idx_queue_scheduled ON upload_queue(scheduled_time);
 CREATE INDEX idx_queue_channel ON upload_queue(channel_id);
 CREATE INDEX idx_queue_created ON upload_queue(created_at DESC);
+CREATE INDEX idx_queue_cleanup ON upload_queue(updated_at) WHERE status IN ('uploaded', 'failed');
+CREATE INDEX idx_queue_pending ON upload_queue(priority DESC, created_at ASC) WHERE status = 'pending';
 
 -- ============================================
 -- 3. upload_history table
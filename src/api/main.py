@@ -170,6 +170,8 @@ def setup_events(app: FastAPI):
     @app.on_event("shutdown")
     async def shutdown_event():
         logger.info("API server shutting down...")
+        from src.utils.database import get_db_manager
+        await get_db_manager().close()
 
 async def start_server(app: FastAPI, host: str, port: int):
     """Start the uvicorn server"""
@@ -52,6 +52,12 @@ class Settings(BaseSettings):
     supabase_anon_key: str = Field(default="", env="SUPABASE_ANON_KEY")
     supabase_service_key: str = Field(default="", env="SUPABASE_SERVICE_KEY")
     
+    # Direct Postgres connection pool (used when SUPABASE_DB_URL/DATABASE_URL is set)
+    db_pool_min_size: int = Field(default=5, env="DB_POOL_MIN_SIZE")
+    db_pool_max_size: int = Field(default=20, env="DB_POOL_MAX_SIZE")
+    db_pool_max_queries: int = Field(default=50000, env="DB_POOL_MAX_QUERIES")
+    db_statement_cache_size: int = Field(default=2048, env="DB_STATEMENT_CACHE_SIZE")
+    
     # Paths
     watch_folder_path: Path = Field(default=Path("/tmp/watch"), env="WATCH_FOLDER_PATH")
     temp_folder_path: Path = Field(default=Path("/tmp/temp"), env="TEMP_FOLDER_PATH")
@@ -67,10 +73,14 @@ class Settings(BaseSettings):
     )
     batch_size: int = Field(default=10, env="BATCH_SIZE")
     worker_threads: int = Field(default=4, env="WORKER_THREADS")
+    # Videos the folder watcher runs through the pipeline at once
+    watcher_concurrency: int = Field(default=2, env="WATCHER_CONCURRENCY")
     
     # Security
     encryption_key: str = Field(default="", env="ENCRYPTION_KEY")
     jwt_secret_key: str = Field(default="", env="JWT_SECRET_KEY")
+    # Persist the PBKDF2-derived key under $XDG_CACHE_HOME/ugc (opt-in)
+    encryption_key_cache: bool = Field(default=False, env="ENCRYPTION_KEY_CACHE")
     
     # API Server Settings
     api_host: str = Field(default="0.0.0.0", env="API_HOST")
@@ -14,6 +14,7 @@ from src.utils.logger import get_logger
 from src.watchers.enhanced_video_watcher import EnhancedVideoWatcher
 from src.processors.video_processor import get_video_processor
 from src.utils.database import get_db_manager
+from src.utils.event_loop import install_fast_event_loop
 
 logger = get_logger("main_app")
 
@@ -235,4 +236,5 @@ async def main():
     await app.start()
 
 if __name__ == "__main__":
+    install_fast_event_loop()
     asyncio.run(main())
\ No newline at end of file
@@ -5,7 +5,6 @@ Matches products from video analysis to Coupang/shopping links using Google Imag
 
 import asyncio
 import aiohttp
-import json
 from typing import Dict, List, Optional, Any
 from urllib.parse import quote_plus
 import hashlib
@@ -421,7 +420,7 @@ class ProductMatcher:
             
             await self.db.execute_query(
                 query,
-                (json.dumps(infocrlink_data), primary_url, queue_id)
+                (infocrlink_data, primary_url, queue_id)
             )
             
             logger.info(f"Saved product match for queue {queue_id}")
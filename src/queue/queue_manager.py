@@ -4,10 +4,11 @@ Manages upload queue with priority, scheduling, and status tracking
 """
 
 import asyncio
-from typing import Dict, List, Optional, Any
+import functools
+import os
+import random
+from typing import Dict, FrozenSet, List, Mapping, Optional, Any
 from datetime import datetime, timedelta
-from pathlib import Path
-import json
 import uuid
 
 from src.config import settings
@@ -16,24 +17,234 @@ from src.utils.database import get_db_manager
 
 logger = get_logger("queue_manager")
 
+# Queue IDs only need uniqueness, not unpredictability: draw them from a
+# PRNG seeded once instead of hitting os.urandom on every enqueue
+_id_rng = random.Random(os.urandom(16))
+
+# A forked worker inherits the parent's PRNG state; reseed it so parent
+# and children never hand out the same IDs
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: _id_rng.seed(os.urandom(16)))
+
+def _new_queue_id() -> uuid.UUID:
+    """Return a random version-4 UUID for a new queue entry"""
+    return uuid.UUID(int=_id_rng.getrandbits(128), version=4)
+
+def _stat_sizes(paths: List[str]) -> List[Optional[int]]:
+    """Return the size of each path, or None if it cannot be stat'ed"""
+    sizes = []
+    for path in paths:
+        try:
+            sizes.append(os.stat(path).st_size)
+        except FileNotFoundError:
+            sizes.append(None)
+        except OSError as e:
+            # Unreadable (permissions, NAS errors): skip just this row
+            logger.error(f"Cannot stat video file {path}: {e}")
+            sizes.append(None)
+    return sizes
+
+def _queue_status_query(*conditions: str) -> str:
+    """Build the queue listing SQL for the given WHERE conditions"""
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"""
+    SELECT 
+        q.*,
+        c.channel_name,
+        c.channel_type,
+        c.category as channel_category
+    FROM upload_queue q
+    LEFT JOIN youtube_channels c ON q.channel_id = c.id
+    {where_clause}
+    ORDER BY 
+        CASE q.status
+            WHEN 'processing' THEN 1
+            WHEN 'ready' THEN 2
+            WHEN 'pending' THEN 3
+            WHEN 'failed' THEN 4
+            WHEN 'uploaded' THEN 5
+            ELSE 6
+        END,
+        q.priority DESC,
+        q.created_at DESC
+    LIMIT ${len(conditions) + 1}
+"""
+
+# get_queue_status SQL keyed by (has status filter, has channel filter)
+_SQL_GET_STATUS = {
+    (False, False): _queue_status_query(),
+    (True, False): _queue_status_query("q.status = $1"),
+    (False, True): _queue_status_query("q.channel_id = $1"),
+    (True, True): _queue_status_query("q.status = $1", "q.channel_id = $2"),
+}
+
+_SQL_INSERT_QUEUE = """
+    INSERT INTO upload_queue (
+        id,
+        video_file_path,
+        video_file_name,
+        file_size_mb,
+        channel_id,
+        title,
+        description,
+        tags,
+        coupang_url,
+        infocrlink_data,
+        status,
+        priority,
+        scheduled_time,
+        created_at,
+        updated_at
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, NOW(), NOW()
+    )
+"""
+
+_SQL_NEXT_VIDEO = """
+    WITH next AS (
+        SELECT q.id
+        FROM upload_queue q
+        JOIN youtube_channels c ON q.channel_id = c.id
+        WHERE q.status = 'pending'
+            AND c.is_active = true
+            AND (q.scheduled_time IS NULL OR q.scheduled_time <= NOW())
+            AND check_channel_upload_limit(q.channel_id) = true
+        ORDER BY 
+            q.priority DESC,
+            q.created_at ASC
+        LIMIT 1
+        FOR UPDATE OF q SKIP LOCKED
+    )
+    UPDATE upload_queue q
+    SET 
+        status = 'processing',
+        updated_at = NOW()
+    FROM next, youtube_channels c
+    WHERE q.id = next.id
+        AND c.id = q.channel_id
+    RETURNING 
+        q.*,
+        c.channel_name,
+        c.channel_url,
+        c.channel_type,
+        c.category as channel_category,
+        c.account_id,
+        c.account_password,
+        c.infocrlink_url as channel_infocrlink
+"""
+
+_SQL_UPDATE_STATUS = """
+    UPDATE upload_queue
+    SET 
+        status = $1,
+        error_message = $2,
+        updated_at = NOW()
+    WHERE id = $3
+        AND status = ANY($4::text[])
+    RETURNING status
+"""
+
+_SQL_MARK_UPLOADED = """
+    WITH upd AS (
+        UPDATE upload_queue
+        SET 
+            status = 'uploaded',
+            error_message = NULL,
+            updated_at = NOW()
+        WHERE id = $1
+            AND status = ANY($4::text[])
+        RETURNING id, channel_id, video_file_name
+    ),
+    ins AS (
+        INSERT INTO upload_history (
+            queue_id,
+            channel_id,
+            video_file_name,
+            upload_time,
+            youtube_video_id,
+            youtube_video_url,
+            created_at
+        )
+        SELECT id, channel_id, video_file_name, NOW(), $2, $3, NOW()
+        FROM upd
+        RETURNING channel_id
+    )
+    SELECT channel_id, increment_upload_count(channel_id)
+    FROM ins
+"""
+
+_SQL_CLEAN = """
+    WITH deleted AS (
+        DELETE FROM upload_queue
+        WHERE status IN ('uploaded', 'failed')
+            AND updated_at < NOW() - ($1::int * INTERVAL '1 day')
+        RETURNING 1
+    )
+    SELECT COUNT(*) AS count FROM deleted
+"""
+
+_SQL_STATS = """
+    WITH q AS (
+        SELECT 
+            status,
+            COUNT(*) as count,
+            MIN(created_at) as oldest,
+            MAX(created_at) as newest,
+            AVG(file_size_mb) as avg_file_size
+        FROM upload_queue
+        GROUP BY status
+    ),
+    t AS (
+        SELECT COUNT(*) as today_count
+        FROM upload_history
+        WHERE upload_time >= CURRENT_DATE
+    )
+    SELECT 'q' as kind, status, count, oldest, newest, avg_file_size, NULL::bigint as today_count
+    FROM q
+    UNION ALL
+    SELECT 't', NULL, NULL, NULL, NULL, NULL, today_count
+    FROM t
+"""
+
+_SQL_SCHEDULE = """
+    UPDATE upload_queue
+    SET 
+        scheduled_time = $1,
+        updated_at = NOW()
+    WHERE id = $2 AND status = 'pending'
+"""
+
 class QueueManager:
     """Manages the upload queue for videos"""
     
     def __init__(self):
         """Initialize Queue Manager"""
         self.db = get_db_manager()
+        # Hot-path flags bound once; the DSN is fixed after DatabaseManager init
+        self._use_sql = bool(getattr(self.db, 'pg_dsn', None))
+        self._max_mb = settings.max_file_size_mb
+        self._min_mb = settings.min_file_size_mb
         self.status_transitions = self._init_status_transitions()
+        # Inverse table: target status -> statuses allowed to move into it
+        self._inverse_transitions: Dict[str, FrozenSet[str]] = {
+            target: frozenset(
+                source for source, targets in self.status_transitions.items()
+                if target in targets or source == target
+            )
+            for target in self.status_transitions
+        }
         logger.info("Queue Manager initialized")
     
-    def _init_status_transitions(self) -> Dict[str, List[str]]:
+    def _init_status_transitions(self) -> Dict[str, FrozenSet[str]]:
         """Initialize valid status transitions"""
-        return {
+        transitions = {
             "pending": ["processing", "failed"],
             "processing": ["ready", "failed"],
             "ready": ["uploaded", "failed", "pending"],
             "uploaded": [],  # Terminal state
             "failed": ["pending"]  # Can retry
         }
+        return {status: frozenset(targets) for status, targets in transitions.items()}
     
     async def add_to_queue(
         self,
@@ -65,33 +276,37 @@ class QueueManager:
             Queue ID if successful
         """
         try:
-            video_path = Path(video_path)
+            video_path = os.fspath(video_path)
+            video_file_name = os.path.basename(video_path)
 
-            if not video_path.exists():
+            # Single stat() call covers both existence and size
+            try:
+                st = os.stat(video_path)
+            except FileNotFoundError:
                 logger.error(f"Video file not found: {video_path}")
                 return None
 
-            # Get file size
-            file_size_mb = video_path.stat().st_size / (1024 * 1024)
+            file_size_mb = st.st_size / (1024 * 1024)
 
             # Check file size limits
-            if file_size_mb > settings.max_file_size_mb:
+            if file_size_mb > self._max_mb:
                 logger.warning(f"File too large: {file_size_mb:.2f} MB")
                 return None
 
-            if file_size_mb < settings.min_file_size_mb:
+            if file_size_mb < self._min_mb:
                 logger.warning(f"File too small: {file_size_mb:.2f} MB")
                 return None
 
-            # Generate queue ID
-            queue_id = str(uuid.uuid4())
+            # Generate queue ID (passed to asyncpg as a UUID, not text)
+            queue_uuid = _new_queue_id()
+            queue_id = str(queue_uuid)
 
             # If no direct DB connection, use in-memory via DatabaseManager
-            if not getattr(self.db, 'pg_dsn', None):
+            if not self._use_sql:
                 queue_item = {
                     "id": queue_id,
-                    "video_file_path": str(video_path),
-                    "video_file_name": video_path.name,
+                    "video_file_path": video_path,
+                    "video_file_name": video_file_name,
                     "file_size_mb": file_size_mb,
                     "channel_id": channel_id,
                     "title": title,
@@ -105,16 +320,15 @@ class QueueManager:
                 }
                 rec = await self.db.add_to_queue(queue_item)
                 if rec:
-                    logger.info(f"Added video to queue (memory): {queue_id} - {video_path.name}")
+                    logger.info(f"Added video to queue (memory): {queue_id} - {video_file_name}")
                     return rec.get('id', queue_id)
                 logger.error("Failed to add to memory queue")
                 return None
 
             # Insert into SQL queue
-            query = """
-            INSERT INTO upload_queue (
-                id,
-                video_file_path,
+            params = (
+                queue_uuid,
+                video_path,
                 video_file_name,
                 file_size_mb,
                 channel_id,
@@ -123,42 +337,79 @@ class QueueManager:
                 tags,
                 coupang_url,
                 infocrlink_data,
-                status,
-                priority,
-                scheduled_time,
-                created_at,
-                updated_at
-            ) VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW()
-            )
-            """
-
-            params = (
-                queue_id,
-                str(video_path),
-                video_path.name,
-                file_size_mb,
-                channel_id,
-                title,
-                description,
-                tags,
-                coupang_url,
-                json.dumps(infocrlink_data) if infocrlink_data else None,
                 "pending",
                 priority,
                 scheduled_time
             )
 
-            await self.db.execute_query(query, params)
+            async with self.db.acquire() as conn:
+                await conn.execute(_SQL_INSERT_QUEUE, *params)
 
-            logger.info(f"Added video to queue: {queue_id} - {video_path.name}")
+            logger.info(f"Added video to queue: {queue_id} - {video_file_name}")
             return queue_id
 
         except Exception as e:
             logger.error(f"Error adding to queue: {e}")
             return None
     
-    async def get_next_video(self) -> Optional[Dict[str, Any]]:
+    async def add_to_queue_many(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add several videos to the upload queue in one batch
+        
+        Args:
+            rows: Dicts carrying the add_to_queue arguments (video_path,
+                channel_id, title, description, tags and optional
+                coupang_url, infocrlink_data, priority, scheduled_time)
+            
+        Returns:
+            Queue IDs of the rows that were accepted
+        """
+        try:
+            paths = [os.fspath(row["video_path"]) for row in rows]
+            sizes = await asyncio.to_thread(_stat_sizes, paths)
+
+            items = []
+            for row, video_path, size in zip(rows, paths, sizes):
+                if size is None:
+                    logger.error(f"Video file not found or unreadable: {video_path}")
+                    continue
+
+                file_size_mb = size / (1024 * 1024)
+                if file_size_mb > self._max_mb:
+                    logger.warning(f"File too large: {file_size_mb:.2f} MB")
+                    continue
+                if file_size_mb < self._min_mb:
+                    logger.warning(f"File too small: {file_size_mb:.2f} MB")
+                    continue
+
+                items.append({
+                    "id": str(_new_queue_id()),
+                    "video_file_path": video_path,
+                    "video_file_name": os.path.basename(video_path),
+                    "file_size_mb": file_size_mb,
+                    "channel_id": row["channel_id"],
+                    "title": row["title"],
+                    "description": row["description"],
+                    "tags": row["tags"],
+                    "coupang_url": row.get("coupang_url"),
+                    "infocrlink_data": row.get("infocrlink_data"),
+                    "status": "pending",
+                    "priority": row.get("priority", 50),
+                    "scheduled_time": row.get("scheduled_time"),
+                })
+
+            # One COPY / bulk insert for the whole batch instead of a row each
+            inserted = await self.db.add_many_to_queue(items)
+            queue_ids = [str(rec["id"]) for rec in inserted if rec]
+
+            logger.info(f"Added {len(queue_ids)} videos to queue")
+            return queue_ids
+
+        except Exception as e:
+            logger.error(f"Error adding batch to queue: {e}")
+            return []
+    
+    async def get_next_video(self) -> Optional[Mapping[str, Any]]:
         """
         Get the next video to process from queue
         
@@ -167,46 +418,15 @@ class QueueManager:
         """
         try:
             # In-memory fallback
-            if not getattr(self.db, 'pg_dsn', None):
-                items = await self.db.get_queue_items(status='pending', limit=1)
-                if items:
-                    entry = items[0]
-                    await self.db.update_queue_item(entry['id'], {"status": "processing"})
-                    logger.info(f"Retrieved queue entry (memory): {entry['id']}")
-                    return entry
-                return None
-
-            query = """
-            SELECT 
-                q.*,
-                c.channel_name,
-                c.channel_url,
-                c.channel_type,
-                c.category as channel_category,
-                c.account_id,
-                c.account_password,
-                c.infocrlink_url as channel_infocrlink
-            FROM upload_queue q
-            JOIN youtube_channels c ON q.channel_id = c.id
-            WHERE q.status = 'pending'
-                AND c.is_active = true
-                AND (q.scheduled_time IS NULL OR q.scheduled_time <= NOW())
-                AND check_channel_upload_limit(q.channel_id) = true
-            ORDER BY 
-                q.priority DESC,
-                q.created_at ASC
-            LIMIT 1
-            FOR UPDATE SKIP LOCKED
-            """
-            
-            result = await self.db.execute_query(query)
+            if not self._use_sql:
+                return await self._take_pending_inmem("memory")
 
-            if result and result.data:
-                queue_entry = result.data[0]
-
-                # Update status to processing
-                await self.update_status(queue_entry['id'], 'processing')
+            # Claim and flip the next pending row in a single round-trip;
+            # the status transition is enforced by the WHERE clause itself
+            async with self.db.acquire() as conn:
+                queue_entry = await conn.fetchrow(_SQL_NEXT_VIDEO)
 
+            if queue_entry:
                 logger.info(f"Retrieved queue entry: {queue_entry['id']}")
                 return queue_entry
 
@@ -216,15 +436,16 @@ class QueueManager:
             logger.error(f"Error getting next video: {e}")
             # Fallback to REST/memory queue
             try:
-                items = await self.db.get_queue_items(status='pending', limit=1)
-                if items:
-                    entry = items[0]
-                    await self.db.update_queue_item(entry['id'], {"status": "processing"})
-                    logger.info(f"Retrieved queue entry (fallback): {entry['id']}")
-                    return entry
+                return await self._take_pending_inmem("fallback")
             except Exception:
-                pass
-            return None
+                return None
+    
+    async def _take_pending_inmem(self, label: str) -> Optional[Dict[str, Any]]:
+        """Claim the next pending entry through DatabaseManager (REST/memory)"""
+        entry = await self.db.pop_next_pending()
+        if entry:
+            logger.info(f"Retrieved queue entry ({label}): {entry['id']}")
+        return entry
     
     async def update_status(
         self,
@@ -244,69 +465,45 @@ class QueueManager:
             Success status
         """
         try:
-            # Get current status
-            current_status = await self._get_current_status(queue_id)
-            
-            if not current_status:
-                logger.error(f"Queue entry not found: {queue_id}")
+            allowed_prev = self._inverse_transitions.get(new_status)
+            if not allowed_prev:
+                logger.warning(f"Invalid target status: {new_status}")
                 return False
             
-            # Check if transition is valid
-            valid_transitions = self.status_transitions.get(current_status, [])
+            # Validate and apply the transition in one compare-and-swap update
+            if not self._use_sql:
+                updated = await self.db.update_queue_item(
+                    queue_id,
+                    {"status": new_status, "error_message": error_message},
+                    expected_status=allowed_prev
+                )
+            else:
+                async with self.db.acquire() as conn:
+                    updated = await conn.fetchval(
+                        _SQL_UPDATE_STATUS,
+                        new_status, error_message, queue_id, allowed_prev
+                    )
             
-            if new_status not in valid_transitions and new_status != current_status:
+            if not updated:
                 logger.warning(
-                    f"Invalid status transition: {current_status} -> {new_status}"
+                    f"Queue {queue_id} not updated to {new_status}: "
+                    f"no matching row or invalid transition"
                 )
                 return False
             
-            # Update status
-            if not getattr(self.db, 'pg_dsn', None):
-                await self.db.update_queue_item(queue_id, {"status": new_status, "error_message": error_message})
-            else:
-                query = """
-                UPDATE upload_queue
-                SET 
-                    status = %s,
-                    error_message = %s,
-                    updated_at = NOW()
-                WHERE id = %s
-                """
-                await self.db.execute_query(query, (new_status, error_message, queue_id))
-            
-            logger.info(f"Updated queue {queue_id}: {current_status} -> {new_status}")
+            logger.info(f"Updated queue {queue_id} -> {new_status}")
             return True
             
         except Exception as e:
             logger.error(f"Error updating status: {e}")
             return False
     
-    async def _get_current_status(self, queue_id: str) -> Optional[str]:
-        """Get current status of queue entry"""
-        try:
-            if not getattr(self.db, 'pg_dsn', None):
-                items = await self.db.get_queue_items(limit=100)
-                for it in items:
-                    if it.get('id') == queue_id:
-                        return it.get('status')
-                return None
-
-            query = "SELECT status FROM upload_queue WHERE id = %s"
-            result = await self.db.execute_query(query, (queue_id,))
-            if result and result.data:
-                return result.data[0]['status']
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error getting current status: {e}")
-            return None
-    
     async def get_queue_status(
         self,
         status_filter: Optional[str] = None,
         channel_id: Optional[str] = None,
         limit: int = 100
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Mapping[str, Any]]:
         """
         Get queue entries by status
         
@@ -320,52 +517,16 @@ class QueueManager:
         """
         try:
             # In-memory fallback
-            if not getattr(self.db, 'pg_dsn', None):
+            if not self._use_sql:
                 items = await self.db.get_queue_items(status=status_filter, limit=limit)
                 if channel_id:
                     items = [i for i in items if i.get('channel_id') == channel_id]
                 return items
 
-            conditions = []
-            params = []
-
-            if status_filter:
-                conditions.append("q.status = %s")
-                params.append(status_filter)
-
-            if channel_id:
-                conditions.append("q.channel_id = %s")
-                params.append(channel_id)
-
-            where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-
-            query = f"""
-            SELECT 
-                q.*,
-                c.channel_name,
-                c.channel_type,
-                c.category as channel_category
-            FROM upload_queue q
-            LEFT JOIN youtube_channels c ON q.channel_id = c.id
-            {where_clause}
-            ORDER BY 
-                CASE q.status
-                    WHEN 'processing' THEN 1
-                    WHEN 'ready' THEN 2
-                    WHEN 'pending' THEN 3
-                    WHEN 'failed' THEN 4
-                    WHEN 'uploaded' THEN 5
-                    ELSE 6
-                END,
-                q.priority DESC,
-                q.created_at DESC
-            LIMIT %s
-            """
-
-            params.append(limit)
-            result = await self.db.execute_query(query, params)
-
-            return result.data if result else []
+            query = _SQL_GET_STATUS[(bool(status_filter), bool(channel_id))]
+            params = tuple(p for p in (status_filter, channel_id) if p) + (limit,)
+            async with self.db.acquire() as conn:
+                return await conn.fetch(query, *params)
 
         except Exception as e:
             logger.error(f"Error getting queue status: {e}")
@@ -389,55 +550,37 @@ class QueueManager:
             Success status
         """
         try:
-            # Begin transaction
-            async with self.db.transaction():
-                # Update queue status
-                await self.update_status(queue_id, "uploaded")
-                
-                # Get queue entry details
-                query = """
-                SELECT 
-                    channel_id,
-                    video_file_name
-                FROM upload_queue
-                WHERE id = %s
-                """
-                
-                result = await self.db.execute_query(query, (queue_id,))
-                
-                if not result or not result.data:
-                    raise Exception("Queue entry not found")
-                
-                queue_data = result.data[0]
-                
-                # Insert into history
-                history_query = """
-                INSERT INTO upload_history (
+            if not self._use_sql:
+                rec = await self.db.update_queue_item(
                     queue_id,
-                    channel_id,
-                    video_file_name,
-                    upload_time,
-                    youtube_video_id,
-                    youtube_video_url,
-                    created_at
-                ) VALUES (
-                    %s, %s, %s, NOW(), %s, %s, NOW()
+                    {"status": "uploaded", "error_message": None},
+                    expected_status=self._inverse_transitions["uploaded"]
                 )
-                """
-                
-                await self.db.execute_query(
-                    history_query,
-                    (
+                if rec:
+                    await self.db.record_upload({
+                        "queue_id": queue_id,
+                        "channel_id": rec.get("channel_id"),
+                        "video_file_name": rec.get("video_file_name"),
+                        "upload_time": datetime.now().isoformat(),
+                        "youtube_video_id": youtube_video_id,
+                        "youtube_video_url": youtube_video_url,
+                    })
+                uploaded = rec is not None
+            else:
+                # Status flip, history insert and upload count bump run as one
+                # atomic statement (a single round-trip, row lock held briefly)
+                async with self.db.acquire() as conn:
+                    row = await conn.fetchrow(
+                        _SQL_MARK_UPLOADED,
                         queue_id,
-                        queue_data['channel_id'],
-                        queue_data['video_file_name'],
                         youtube_video_id,
-                        youtube_video_url
+                        youtube_video_url,
+                        self._inverse_transitions["uploaded"]
                     )
-                )
-                
-                # Increment channel upload count
-                await self._increment_upload_count(queue_data['channel_id'])
+                uploaded = row is not None
+            
+            if not uploaded:
+                raise Exception("Queue entry not found or not ready for upload")
             
             logger.info(f"Marked as uploaded: {queue_id} -> {youtube_video_id}")
             return True
@@ -446,14 +589,6 @@ class QueueManager:
             logger.error(f"Error marking as uploaded: {e}")
             return False
     
-    async def _increment_upload_count(self, channel_id: str):
-        """Increment channel upload count for today"""
-        try:
-            query = "SELECT increment_upload_count(%s)"
-            await self.db.execute_query(query, (channel_id,))
-        except Exception as e:
-            logger.error(f"Error incrementing upload count: {e}")
-    
     async def retry_failed(self, queue_id: str) -> bool:
         """
         Retry a failed queue entry
@@ -483,15 +618,12 @@ class QueueManager:
             Number of entries cleaned
         """
         try:
-            query = """
-            DELETE FROM upload_queue
-            WHERE status IN ('uploaded', 'failed')
-                AND updated_at < NOW() - INTERVAL '%s days'
-            """
-            
-            result = await self.db.execute_query(query, (days,))
-            
-            count = result.rowcount if result else 0
+            if not self._use_sql:
+                return 0
+
+            # Served by the partial index idx_queue_cleanup
+            async with self.db.acquire() as conn:
+                count = await conn.fetchval(_SQL_CLEAN, days)
             logger.info(f"Cleaned {count} old queue entries")
             
             return count
@@ -508,26 +640,22 @@ class QueueManager:
             Queue statistics
         """
         try:
-            query = """
-            SELECT 
-                status,
-                COUNT(*) as count,
-                MIN(created_at) as oldest,
-                MAX(created_at) as newest,
-                AVG(file_size_mb) as avg_file_size
-            FROM upload_queue
-            GROUP BY status
-            """
-            
-            result = await self.db.execute_query(query)
-            
             stats = {
                 "by_status": {},
                 "total": 0
             }
-            
-            if result and result.data:
-                for row in result.data:
+            if not self._use_sql:
+                return stats
+
+            # Per-status aggregates and today's upload count in one round-trip
+            async with self.db.acquire() as conn:
+                rows = await conn.fetch(_SQL_STATS)
+            
+            if rows:
+                for row in rows:
+                    if row['kind'] == 't':
+                        stats["today_uploads"] = row['today_count']
+                        continue
                     stats["by_status"][row['status']] = {
                         "count": row['count'],
                         "oldest": row['oldest'],
@@ -536,17 +664,6 @@ class QueueManager:
                     }
                     stats["total"] += row['count']
             
-            # Get today's uploads
-            today_query = """
-            SELECT COUNT(*) as today_count
-            FROM upload_history
-            WHERE upload_time >= CURRENT_DATE
-            """
-            
-            today_result = await self.db.execute_query(today_query)
-            if today_result and today_result.data:
-                stats["today_uploads"] = today_result.data[0]['today_count']
-            
             return stats
             
         except Exception as e:
@@ -569,15 +686,15 @@ class QueueManager:
             Success status
         """
         try:
-            query = """
-            UPDATE upload_queue
-            SET 
-                scheduled_time = %s,
-                updated_at = NOW()
-            WHERE id = %s AND status = 'pending'
-            """
-            
-            await self.db.execute_query(query, (scheduled_time, queue_id))
+            if not self._use_sql:
+                await self.db.update_queue_item(
+                    queue_id,
+                    {"scheduled_time": scheduled_time},
+                    expected_status=("pending",)
+                )
+            else:
+                async with self.db.acquire() as conn:
+                    await conn.execute(_SQL_SCHEDULE, scheduled_time, queue_id)
             
             logger.info(f"Scheduled {queue_id} for {scheduled_time}")
             return True
@@ -586,12 +703,8 @@ class QueueManager:
             logger.error(f"Error scheduling upload: {e}")
             return False
 
-# Global manager instance
-_manager: Optional[QueueManager] = None
-
+# Global manager instance (memoized factory)
+@functools.cache
 def get_queue_manager() -> QueueManager:
     """Get or create global queue manager"""
-    global _manager
-    if _manager is None:
-        _manager = QueueManager()
-    return _manager
+    return QueueManager()
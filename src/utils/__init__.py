@@ -5,5 +5,12 @@ Utils Package
 from .logger import setup_logger, get_logger
 from .database import get_db_manager
 from .encryption import get_encryption_manager
+from .event_loop import install_fast_event_loop
 
-__all__ = ["setup_logger", "get_logger", "get_db_manager", "get_encryption_manager"]
\ No newline at end of file
+__all__ = [
+    "setup_logger",
+    "get_logger",
+    "get_db_manager",
+    "get_encryption_manager",
+    "install_fast_event_loop",
+]
\ No newline at end of file
@@ -2,28 +2,144 @@
 Database connection and utilities supporting Supabase and direct Postgres SQL.
 
 Provides a unified async API used across the app:
-- execute_query: run raw SQL (uses psycopg2 under the hood if DSN is provided)
+- execute_query: run raw SQL (uses an asyncpg pool under the hood if DSN is provided)
 - test_connection: check DB connectivity
 - transaction: async context manager for transactional operations
 
 Falls back gracefully in development when DB is not configured.
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Collection
 from types import SimpleNamespace
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import os
+import re
 import asyncio
-from datetime import datetime, timedelta
+import bisect
+import threading
+import heapq
+import time
+import itertools
+from functools import lru_cache
+from datetime import datetime
 
 from supabase import create_client, Client
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import asyncpg
+import httpx
+import orjson
+from cachetools import TTLCache
 import socket
 from urllib.parse import urlparse
 
 from src.config import settings
 from src.utils.encryption import get_encryption_manager
+from src.utils.logger import get_logger
+
+logger = get_logger("database")
+
+_PLACEHOLDER_RE = re.compile(r"%s")
+
+@lru_cache(maxsize=512)
+def _to_pg_placeholders(query: str) -> str:
+    """Rewrite psycopg-style %s placeholders into asyncpg's $1..$N form."""
+    counter = itertools.count(1)
+    return _PLACEHOLDER_RE.sub(lambda _m: f"${next(counter)}", query)
+
+# Connection of the transaction open in the current task (each asyncio task
+# runs in its own context, so concurrent transactions never share one)
+_tx_conn_var: ContextVar[Optional[asyncpg.Connection]] = ContextVar('tx_conn', default=None)
+
+# (epoch second, its ISO prefix); one tuple so readers never see a torn pair
+_iso_second: Tuple[int, str] = (0, "")
+
+def _now_iso() -> str:
+    """datetime.now().isoformat() with the per-second formatting cached."""
+    global _iso_second
+    t = time.time()
+    sec = int(t)
+    cached_sec, prefix = _iso_second
+    if sec != cached_sec:
+        prefix = datetime.fromtimestamp(sec).isoformat(timespec='seconds')
+        _iso_second = (sec, prefix)
+    return f"{prefix}.{int((t - sec) * 1e6):06d}"
+
+# Lifetime of a cached video analysis
+_ANALYSIS_TTL_SECONDS = 7 * 24 * 3600
+
+# Version byte that prefixes jsonb values in the binary wire format
+_JSONB_VERSION = b'\x01'
+
+def _jsonb_encode(value: Any) -> bytes:
+    """Serialize a jsonb parameter with orjson into the binary wire format."""
+    return _JSONB_VERSION + orjson.dumps(value)
+
+def _jsonb_decode(data: bytes) -> Any:
+    """Parse a binary jsonb value (version byte + JSON text) with orjson."""
+    return orjson.loads(data[1:])
+
+# Writable youtube_channels columns, in the order used by the fixed templates
+_CHANNEL_COLS = (
+    'channel_name', 'channel_url', 'channel_type', 'parent_channel_id', 'category',
+    'description', 'account_id', 'account_password', 'max_daily_uploads', 'is_active',
+    'infocrlink_url',
+)
+# Column defaults applied when the caller passes no value (NULL)
+_CHANNEL_DEFAULTS = {'max_daily_uploads': '3', 'is_active': 'true'}
+
+# One SQL text per statement so asyncpg reuses the prepared plan; missing
+# fields are passed as NULL and COALESCE keeps the default / current value
+_SQL_INSERT_CHANNEL = (
+    f"INSERT INTO youtube_channels ({', '.join(_CHANNEL_COLS)}) VALUES ("
+    + ", ".join(
+        f"COALESCE(%s, {_CHANNEL_DEFAULTS[c]})" if c in _CHANNEL_DEFAULTS else "%s"
+        for c in _CHANNEL_COLS
+    )
+    + ") RETURNING *"
+)
+_CHANNEL_COL_SET = frozenset(_CHANNEL_COLS)
+# $1..$N are the new values (NULL = keep), $N+1 the id and $N+2 the names of
+# the columns to set to NULL, so a present-but-None key can still clear a field
+_SQL_UPDATE_CHANNEL = (
+    "UPDATE youtube_channels SET "
+    + ", ".join(
+        f"{c} = CASE WHEN '{c}' = ANY(${len(_CHANNEL_COLS) + 2}::text[]) "
+        f"THEN NULL ELSE COALESCE(${i}, {c}) END"
+        for i, c in enumerate(_CHANNEL_COLS, 1)
+    )
+    + f", updated_at = NOW() WHERE id = ${len(_CHANNEL_COLS) + 1} RETURNING *"
+)
+
+# Insert the history row and bump the daily counter in one atomic round-trip;
+# a volatile function in the outer select list runs once per returned row
+_SQL_RECORD_UPLOAD = """
+WITH ins AS (
+    INSERT INTO upload_history
+        (queue_id, channel_id, video_file_name, upload_time, youtube_video_id, youtube_video_url)
+    VALUES (%s, %s, %s, COALESCE(%s::timestamptz, NOW()), %s, %s)
+    RETURNING *
+)
+SELECT
+    ins.*,
+    CASE WHEN ins.channel_id IS NOT NULL
+        THEN increment_upload_count(ins.channel_id)
+    END AS _counted
+FROM ins
+"""
+
+async def _init_connection(conn: asyncpg.Connection):
+    """
+    Per-connection setup: map jsonb to Python objects once via orjson.
+    The codec is binary because COPY (copy_records_to_table) only accepts
+    binary encoders; regular queries use it as well.
+    """
+    await conn.set_type_codec(
+        'jsonb',
+        encoder=_jsonb_encode,
+        decoder=_jsonb_decode,
+        schema='pg_catalog',
+        format='binary'
+    )
 
 class DatabaseManager:
     """Manages Supabase database operations"""
@@ -37,16 +153,36 @@ class DatabaseManager:
             or os.getenv("DATABASE_URL")
             or os.getenv("POSTGRES_URL")
         )
-        # Transaction-scoped connection (async context)
-        self._tx_conn = None
+        # asyncpg pool (created lazily on first query); statements are
+        # prepared once per connection and reused via asyncpg's statement cache
+        self.pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
         self.encryption = get_encryption_manager()
         # In-memory fallback stores (development without DB)
         self._memory_enabled = not bool(self.pg_dsn)
         self._mem_queue: Dict[str, Dict[str, Any]] = {}
+        # Pending min-heap of (-priority, created_at, seq, id), matching the SQL
+        # ORDER BY priority DESC, created_at ASC; seq breaks ties and marks
+        # stale entries, which are skipped lazily on pop via _mem_pending_seq
+        self._mem_pending_heap: List[Tuple[int, str, int, str]] = []
+        self._mem_pending_seq: Dict[str, int] = {}
+        self._mem_seq = itertools.count()
+        # status -> sorted [(created_at, id)], kept in step with _mem_queue so
+        # the overview reads count/oldest/newest without scanning
+        self._mem_by_status: Dict[str, List[Tuple[str, str]]] = {}
         self._mem_channels: Dict[str, Dict[str, Any]] = {}
+        self._mem_channels_by_name: Dict[str, str] = {}  # channel_name -> id
         self._mem_history: List[Dict[str, Any]] = []
         self._mem_analysis_cache: Dict[str, Dict[str, Any]] = {}
         self._mem_channel_uploads: Dict[str, int] = {}
+        # Short-lived read caches for the DB/REST paths (memory mode is
+        # already a dict lookup and never populates them)
+        self._channel_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+        self._channel_list_cache: TTLCache = TTLCache(maxsize=1, ttl=60)
+        self._analysis_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+        # Shared async PostgREST client for hot Supabase reads (writes stay
+        # on supabase-py); set up alongside self.client in _connect
+        self._http: Optional[httpx.AsyncClient] = None
         self._connect()
     
     def _connect(self):
@@ -58,17 +194,24 @@ class DatabaseManager:
                     settings.supabase_url,
                     settings.supabase_anon_key
                 )
-                print("✅ Connected to Supabase REST API")
+                self._http = httpx.AsyncClient(
+                    base_url=f"{settings.supabase_url.rstrip('/')}/rest/v1",
+                    headers={
+                        "apikey": settings.supabase_anon_key,
+                        "Authorization": f"Bearer {settings.supabase_anon_key}",
+                    },
+                )
+                logger.info("Connected to Supabase REST API")
                 # Disable DSN for now to avoid connection errors
                 self.pg_dsn = None
             else:
                 self.client = None
-                print("⚠️  No Supabase credentials configured")
+                logger.warning("No Supabase credentials configured")
         except Exception as e:
             # Graceful fallback if library/env mismatch
             self.client = None
             self.pg_dsn = None
-            print(f"⚠️  Supabase client init failed: {e}. Falling back to in-memory store.")
+            logger.warning(f"Supabase client init failed: {e}. Falling back to in-memory store.")
 
     async def test_connection(self) -> bool:
         """Test database connectivity (Postgres DSN if available)."""
@@ -76,40 +219,101 @@ class DatabaseManager:
             # No DSN configured
             return False
         try:
-            def _probe():
-                conn = psycopg2.connect(self.pg_dsn)
-                conn.close()
-                return True
-            return await asyncio.to_thread(_probe)
+            async with self.acquire() as conn:
+                await conn.fetchval("SELECT 1")
+            return True
         except Exception:
             return False
 
+    async def _rest_select(self, table: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """GET rows from PostgREST without blocking the event loop."""
+        response = await self._http.get(f"/{table}", params=params)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def _rest_insert(self, table: str, payload: Any) -> List[Dict[str, Any]]:
+        """POST row(s) to PostgREST (orjson-encoded) and return the inserted rows."""
+        response = await self._http.post(
+            f"/{table}",
+            content=orjson.dumps(payload),
+            headers={
+                "Content-Type": "application/json",
+                "Prefer": "return=representation",
+            },
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def _ensure_pool(self) -> asyncpg.Pool:
+        """Create the asyncpg connection pool on first use."""
+        if self.pool is None:
+            async with self._pool_lock:
+                if self.pool is None:
+                    self.pool = await asyncpg.create_pool(
+                        self.pg_dsn,
+                        min_size=settings.db_pool_min_size,
+                        max_size=settings.db_pool_max_size,
+                        max_queries=settings.db_pool_max_queries,
+                        statement_cache_size=settings.db_statement_cache_size,
+                        init=_init_connection,
+                    )
+        return self.pool
+
+    async def close(self):
+        """Close the asyncpg pool and the PostgREST HTTP client (safe to call twice)."""
+        pool, self.pool = self.pool, None
+        if pool is not None:
+            await pool.close()
+        http, self._http = self._http, None
+        if http is not None:
+            await http.aclose()
+
     async def execute_query(self, query: str, params: Optional[tuple] = None):
         """
-        Execute a SQL query using psycopg2.
-        Returns an object with .data (list[dict]) and .rowcount (int).
+        Execute a SQL query using the asyncpg pool.
+        Accepts both %s and $N placeholders; the SQL text is kept stable so
+        asyncpg reuses the prepared statement on every call.
+        Returns an object with .data (list[dict]) and .rowcount (int, number
+        of rows returned - use RETURNING to count affected rows).
         In development without DB, returns empty result to keep app running.
         """
         if not self.pg_dsn:
             # Graceful fallback: return empty result
             return SimpleNamespace(data=[], rowcount=0)
 
-        def _run_query():
-            # Use transaction-scoped connection if present
-            conn = self._tx_conn or psycopg2.connect(self.pg_dsn)
-            try:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    cur.execute(query, params or ())
-                    rows = cur.fetchall() if cur.description else []
-                    rowcount = cur.rowcount
-                if not self._tx_conn:
-                    conn.commit()
-                return SimpleNamespace(data=list(rows), rowcount=rowcount)
-            finally:
-                if not self._tx_conn:
-                    conn.close()
-
-        return await asyncio.to_thread(_run_query)
+        rows = await self.fetch_records(query, params)
+        return SimpleNamespace(data=[dict(r) for r in rows], rowcount=len(rows))
+
+    async def fetch_records(self, query: str, params: Optional[tuple] = None) -> List[asyncpg.Record]:
+        """
+        Like execute_query, but return asyncpg Records as-is.
+        Records are read-only mappings (record['col'], record.get('col')),
+        so hot paths can skip building a dict per row.
+        """
+        if not self.pg_dsn:
+            return []
+
+        sql = _to_pg_placeholders(query)
+        args = tuple(params) if params else ()
+
+        # Use transaction-scoped connection if present
+        tx_conn = _tx_conn_var.get()
+        if tx_conn is not None:
+            return await tx_conn.fetch(sql, *args)
+        pool = await self._ensure_pool()
+        async with pool.acquire() as conn:
+            return await conn.fetch(sql, *args)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Yield a raw asyncpg connection (the transaction one if active)."""
+        tx_conn = _tx_conn_var.get()
+        if tx_conn is not None:
+            yield tx_conn
+            return
+        pool = await self._ensure_pool()
+        async with pool.acquire() as conn:
+            yield conn
 
     @asynccontextmanager
     async def transaction(self):
@@ -118,82 +322,78 @@ class DatabaseManager:
             # No-op transaction for development
             yield
             return
-        conn = None
-        try:
-            def _open():
-                return psycopg2.connect(self.pg_dsn)
-            conn = await asyncio.to_thread(_open)
-            conn.autocommit = False
-            self._tx_conn = conn
-            yield
-            await asyncio.to_thread(conn.commit)
-        except Exception as e:
-            if conn:
-                await asyncio.to_thread(conn.rollback)
-            raise e
-        finally:
-            if conn:
-                await asyncio.to_thread(conn.close)
-            self._tx_conn = None
+        tx_conn = _tx_conn_var.get()
+        if tx_conn is not None:
+            # Nested block in the same task: asyncpg turns this into a savepoint
+            async with tx_conn.transaction():
+                yield
+            return
+        pool = await self._ensure_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                token = _tx_conn_var.set(conn)
+                try:
+                    yield
+                finally:
+                    _tx_conn_var.reset(token)
     
     # Channel Operations
     async def create_channel(self, channel_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new YouTube channel entry"""
         # For now, skip encryption to avoid issues with existing data
-        # We'll re-enable this once we ensure all data is properly handled
-        encrypted_data = channel_data.copy()
+        # We'll re-enable this once we ensure all data is properly handled.
+        # channel_data is only read below, so it is used without a copy.
         
         # Postgres path
         if self.pg_dsn:
-            keys = [
-                'channel_name','channel_url','channel_type','parent_channel_id','category',
-                'description','account_id','account_password','max_daily_uploads','is_active','infocrlink_url'
-            ]
-            cols = []
-            vals = []
-            params = []
-            for k in keys:
-                if k in encrypted_data and encrypted_data[k] is not None:
-                    cols.append(k)
-                    vals.append('%s')
-                    params.append(encrypted_data[k])
-            query = f"INSERT INTO youtube_channels ({', '.join(cols)}) VALUES ({', '.join(vals)}) RETURNING *"
-            result = await self.execute_query(query, tuple(params))
+            params = tuple(channel_data.get(k) for k in _CHANNEL_COLS)
+            result = await self.execute_query(_SQL_INSERT_CHANNEL, params)
+            self._channel_list_cache.clear()
             return result.data[0] if result and result.data else None
         # Supabase path
         if self.client:
-            result = self.client.table('youtube_channels').insert(encrypted_data).execute()
+            result = self.client.table('youtube_channels').insert(channel_data).execute()
+            self._channel_list_cache.clear()
             return result.data[0] if result.data else None
         # In-memory fallback
         import uuid
         channel_id = str(uuid.uuid4())
-        now = datetime.now().isoformat()
+        now = _now_iso()
         record = {
-            **encrypted_data,
+            **channel_data,
             'id': channel_id,
             'is_active': True,
-            'max_daily_uploads': encrypted_data.get('max_daily_uploads', 3),
+            'max_daily_uploads': channel_data.get('max_daily_uploads', 3),
             'created_at': now,
             'updated_at': now
         }
         self._mem_channels[channel_id] = record
+        self._mem_channels_by_name[record.get('channel_name')] = channel_id
         return record
     
     async def get_channel(self, channel_id: str) -> Dict[str, Any]:
         """Get channel by ID"""
+        cached = self._channel_cache.get(channel_id)
+        if cached is not None:
+            return dict(cached)
         if self.pg_dsn:
             query = "SELECT * FROM youtube_channels WHERE id = %s"
             result = await self.execute_query(query, (channel_id,))
             if result.data:
-                return result.data[0]
+                self._channel_cache[channel_id] = result.data[0]
+                return dict(result.data[0])
             return None
         if self.client:
-            result = self.client.table('youtube_channels').select("*").eq('id', channel_id).execute()
-            if result.data:
-                return self.encryption.decrypt_dict(
-                    result.data[0],
+            rows = await self._rest_select(
+                'youtube_channels', {'select': '*', 'id': f'eq.{channel_id}'}
+            )
+            if rows:
+                channel = self.encryption.decrypt_dict(
+                    rows[0],
                     ['account_id', 'account_password']
                 )
+                self._channel_cache[channel_id] = channel
+                return dict(channel)
             return None
         # Memory
         return self._mem_channels.get(channel_id)
@@ -205,37 +405,51 @@ class DatabaseManager:
             result = await self.execute_query(query, (channel_name,))
             return result.data[0] if result and result.data else None
         if self.client:
-            result = self.client.table('youtube_channels').select("*").eq('channel_name', channel_name).limit(1).execute()
-            if result.data:
-                return self.encryption.decrypt_dict(result.data[0], ['account_id', 'account_password'])
+            rows = await self._rest_select(
+                'youtube_channels',
+                {'select': '*', 'channel_name': f'eq.{channel_name}', 'limit': 1}
+            )
+            if rows:
+                return self.encryption.decrypt_dict(rows[0], ['account_id', 'account_password'])
             return None
         # Memory
-        for ch in self._mem_channels.values():
-            if ch.get('channel_name') == channel_name:
-                return ch
-        return None
+        channel_id = self._mem_channels_by_name.get(channel_name)
+        return self._mem_channels.get(channel_id) if channel_id else None
     async def list_channels_all(self) -> List[Dict[str, Any]]:
         """List all channels (active and inactive)."""
+        cached = self._channel_list_cache.get(None)
+        if cached is not None:
+            return [dict(c) for c in cached]
         if self.pg_dsn:
             query = "SELECT * FROM youtube_channels ORDER BY channel_name"
             result = await self.execute_query(query)
-            return result.data if result else []
-        if self.client:
+            channels = result.data if result else []
+        elif self.client:
             result = self.client.table('youtube_channels').select("*").order('channel_name').execute()
-            return [
-                self.encryption.decrypt_dict(r, ['account_id', 'account_password'])
-                for r in (result.data or [])
-            ]
-        return list(self._mem_channels.values())
+            channels = self.encryption.decrypt_dicts(
+                result.data or [], ['account_id', 'account_password']
+            )
+        else:
+            # Copies, like the cached branches, so callers cannot mutate the store
+            return [dict(c) for c in self._mem_channels.values()]
+        self._channel_list_cache[None] = channels
+        return [dict(c) for c in channels]
 
     async def update_channel(self, channel_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Update channel fields"""
+        """
+        Update channel fields.
+        Omitted keys keep their current value; a key given as None sets the
+        column to NULL. Keys that are not youtube_channels columns raise ValueError.
+        """
+        unknown = updates.keys() - _CHANNEL_COL_SET
+        if unknown:
+            raise ValueError(f"Unknown channel field(s): {', '.join(sorted(unknown))}")
+        self._channel_cache.pop(channel_id, None)
+        self._channel_list_cache.clear()
         if self.pg_dsn:
-            # Simplified; build dynamic SQL
-            set_clause = ", ".join([f"{k} = %s" for k in updates.keys()])
-            params = list(updates.values()) + [channel_id]
-            query = f"UPDATE youtube_channels SET {set_clause}, updated_at = NOW() WHERE id = %s RETURNING *"
-            result = await self.execute_query(query, tuple(params))
+            cleared = [k for k, v in updates.items() if v is None]
+            params = tuple(updates.get(k) for k in _CHANNEL_COLS) + (channel_id, cleared)
+            result = await self.execute_query(_SQL_UPDATE_CHANNEL, params)
             return result.data[0] if result and result.data else None
         if self.client:
             # Skip encryption for now
@@ -245,37 +459,58 @@ class DatabaseManager:
         rec = self._mem_channels.get(channel_id)
         if not rec:
             return None
+        if 'channel_name' in updates and updates['channel_name'] != rec.get('channel_name'):
+            if self._mem_channels_by_name.get(rec.get('channel_name')) == channel_id:
+                del self._mem_channels_by_name[rec.get('channel_name')]
+            self._mem_channels_by_name[updates['channel_name']] = channel_id
         rec.update(updates)
         self._mem_channels[channel_id] = rec
         return rec
     
     async def get_available_channels(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get channels that haven't reached upload limit"""
+        if self.pg_dsn:
+            # Channels joined with today's count in a single query
+            query = """
+            SELECT
+                c.*,
+                COALESCE(l.upload_count, 0) AS today_uploads,
+                COALESCE(c.max_daily_uploads, 3) - COALESCE(l.upload_count, 0) AS remaining_uploads
+            FROM youtube_channels c
+            LEFT JOIN channel_upload_limits l
+                ON l.channel_id = c.id AND l.upload_date = CURRENT_DATE
+            WHERE c.is_active = true
+                AND (%s::text IS NULL OR c.category = %s::text)
+                AND COALESCE(l.upload_count, 0) < COALESCE(c.max_daily_uploads, 3)
+            """
+            result = await self.execute_query(query, (category, category))
+            return result.data if result else []
         if self.client:
-            # Get all active channels first
-            query = self.client.table('youtube_channels').select("*").eq('is_active', True)
+            # Embed today's limit row (left join) instead of one query per channel
+            today = datetime.now().date().isoformat()
+            params = {
+                'select': '*,channel_upload_limits(upload_count,upload_date)',
+                'is_active': 'eq.true',
+                'channel_upload_limits.upload_date': f'eq.{today}',
+            }
             if category:
-                query = query.eq('category', category)
-            result = query.execute()
+                params['category'] = f'eq.{category}'
+            rows = await self._rest_select('youtube_channels', params)
             
             channels = []
-            for channel in result.data:
-                # Get today's upload count for this channel
-                today = datetime.now().date().isoformat()
-                upload_result = self.client.table('channel_upload_limits').select("upload_count").eq('channel_id', channel['id']).eq('upload_date', today).execute()
-                today_uploads = upload_result.data[0]['upload_count'] if upload_result.data else 0
+            for channel in rows:
+                limits = channel.pop('channel_upload_limits', None) or []
+                today_uploads = limits[0]['upload_count'] if limits else 0
                 
                 # Check if channel is available
                 max_uploads = channel.get('max_daily_uploads', 3)
                 if today_uploads < max_uploads:
-                    decrypted = self.encryption.decrypt_dict(
-                        channel,
-                        ['account_id', 'account_password']
-                    )
-                    decrypted['today_uploads'] = today_uploads
-                    decrypted['remaining_uploads'] = max_uploads - today_uploads
-                    channels.append(decrypted)
-            return channels
+                    channel['today_uploads'] = today_uploads
+                    channel['remaining_uploads'] = max_uploads - today_uploads
+                    channels.append(channel)
+            return self.encryption.decrypt_dicts(
+                channels, ['account_id', 'account_password']
+            )
         
         # Memory fallback
         items = list(self._mem_channels.values())
@@ -293,34 +528,107 @@ class DatabaseManager:
             # Not implemented: prefer high-level QueueManager SQL path
             return None
         if self.client:
-            result = self.client.table('upload_queue').insert(queue_item).execute()
-            return result.data[0] if result.data else None
+            rows = await self._rest_insert('upload_queue', queue_item)
+            return rows[0] if rows else None
         # Memory
         import uuid
-        now = datetime.now().isoformat()
-        qid = str(uuid.uuid4())
+        now = _now_iso()
+        qid = queue_item.get('id') or str(uuid.uuid4())
         record = {
-            'id': qid,
             'status': 'pending',
             'created_at': now,
             'updated_at': now,
             'error_message': None,
-            **queue_item
+            **queue_item,
+            'id': qid,
         }
+        previous = self._mem_queue.get(qid)
+        if previous:
+            self._reindex_status(previous, previous.get('status'), None)
         self._mem_queue[qid] = record
+        self._reindex_status(record, None, record['status'])
+        if record['status'] == 'pending':
+            self._push_pending(record)
         return record
     
+    def _reindex_status(self, record: Dict[str, Any], old: Optional[str], new: Optional[str]):
+        """Move a memory record between the per-status sorted lists"""
+        if old == new:
+            return
+        key = (record.get('created_at') or '', record['id'])
+        if old is not None:
+            bucket = self._mem_by_status.get(old, [])
+            i = bisect.bisect_left(bucket, key)
+            if i < len(bucket) and bucket[i] == key:
+                del bucket[i]
+        if new is not None:
+            bisect.insort(self._mem_by_status.setdefault(new, []), key)
+    
+    async def add_many_to_queue(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add several items to the upload queue in one round-trip.
+        Every item must carry the same keys (they become the column list).
+        """
+        if not items:
+            return []
+        if self.pg_dsn:
+            columns = tuple(items[0])
+            records = [tuple(item.get(c) for c in columns) for item in items]
+            async with self.acquire() as conn:
+                await conn.copy_records_to_table(
+                    'upload_queue', records=records, columns=columns
+                )
+            return items
+        if self.client:
+            return await self._rest_insert('upload_queue', items)
+        # Memory
+        return [await self.add_to_queue(item) for item in items]
+    
+    def _push_pending(self, record: Dict[str, Any]):
+        """Push a pending memory record onto the priority heap"""
+        seq = next(self._mem_seq)
+        self._mem_pending_seq[record['id']] = seq
+        heapq.heappush(
+            self._mem_pending_heap,
+            (-int(record.get('priority') or 0), record.get('created_at') or '', seq, record['id'])
+        )
+    
+    async def pop_next_pending(self) -> Optional[Dict[str, Any]]:
+        """Claim the highest-priority pending item, marking it processing"""
+        if self.pg_dsn:
+            # Not implemented: QueueManager claims rows with SQL directly
+            return None
+        if self.client:
+            items = await self.get_queue_items(status='pending', limit=1)
+            if not items:
+                return None
+            return await self.update_queue_item(
+                items[0]['id'], {'status': 'processing'}, expected_status=('pending',)
+            )
+        # Memory: O(log N) pop, discarding entries superseded by later updates
+        heap = self._mem_pending_heap
+        while heap:
+            _, _, seq, qid = heapq.heappop(heap)
+            if self._mem_pending_seq.get(qid) != seq:
+                continue
+            del self._mem_pending_seq[qid]
+            rec = self._mem_queue.get(qid)
+            if rec and rec.get('status') == 'pending':
+                rec['status'] = 'processing'
+                rec['updated_at'] = _now_iso()
+                self._reindex_status(rec, 'pending', 'processing')
+                return rec
+        return None
+    
     async def get_queue_items(self, status: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
         """Get items from upload queue"""
         if self.pg_dsn:
             return []
         if self.client:
-            query = self.client.table('upload_queue').select("*")
+            params = {'select': '*', 'order': 'priority.desc', 'limit': limit}
             if status:
-                query = query.eq('status', status)
-            query = query.order('priority', desc=True).limit(limit)
-            result = query.execute()
-            return result.data
+                params['status'] = f'eq.{status}'
+            return await self._rest_select('upload_queue', params)
         # Memory
         items = list(self._mem_queue.values())
         if status:
@@ -328,20 +636,56 @@ class DatabaseManager:
         items.sort(key=lambda x: (-int(x.get('priority', 0)), x.get('created_at', '')))
         return items[:limit]
     
-    async def update_queue_item(self, queue_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
-        """Update queue item status"""
-        updates['updated_at'] = datetime.now().isoformat()
+    async def get_queue_item(self, queue_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single queue item by ID"""
+        if self.pg_dsn:
+            result = await self.execute_query("SELECT * FROM upload_queue WHERE id = %s", (queue_id,))
+            return result.data[0] if result and result.data else None
+        if self.client:
+            rows = await self._rest_select(
+                'upload_queue', {'select': '*', 'id': f'eq.{queue_id}', 'limit': 1}
+            )
+            return rows[0] if rows else None
+        # Memory: direct dict lookup keyed by ID
+        return self._mem_queue.get(queue_id)
+    
+    async def update_queue_item(
+        self,
+        queue_id: str,
+        updates: Dict[str, Any],
+        expected_status: Optional[Collection[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Update queue item status.
+        If expected_status is given, the update only applies while the item's
+        current status is one of them (compare-and-swap).
+        """
+        updates['updated_at'] = _now_iso()
         if self.pg_dsn:
             return None
         if self.client:
-            result = self.client.table('upload_queue').update(updates).eq('id', queue_id).execute()
+            query = self.client.table('upload_queue').update(updates).eq('id', queue_id)
+            if expected_status:
+                query = query.in_('status', list(expected_status))
+            result = query.execute()
             return result.data[0] if result.data else None
         # Memory
         rec = self._mem_queue.get(queue_id)
         if not rec:
             return None
+        if expected_status and rec.get('status') not in expected_status:
+            return None
+        old_status = rec.get('status')
+        was_pending = old_status == 'pending'
         rec.update(updates)
         self._mem_queue[queue_id] = rec
+        self._reindex_status(rec, old_status, rec.get('status'))
+        if rec.get('status') == 'pending':
+            if not was_pending or 'priority' in updates:
+                self._push_pending(rec)
+        else:
+            # Lazy deletion: any heap entry for this item is now stale
+            self._mem_pending_seq.pop(queue_id, None)
         return rec
     
     # Upload Limit Operations
@@ -370,7 +714,23 @@ class DatabaseManager:
     async def record_upload(self, upload_data: Dict[str, Any]) -> Dict[str, Any]:
         """Record successful upload in history"""
         if self.pg_dsn:
-            return None
+            upload_time = upload_data.get('upload_time')
+            if isinstance(upload_time, str):
+                upload_time = datetime.fromisoformat(upload_time)
+            params = (
+                upload_data.get('queue_id'),
+                upload_data.get('channel_id'),
+                upload_data.get('video_file_name'),
+                upload_time,
+                upload_data.get('youtube_video_id'),
+                upload_data.get('youtube_video_url'),
+            )
+            rows = await self.fetch_records(_SQL_RECORD_UPLOAD, params)
+            if not rows:
+                return upload_data
+            record = dict(rows[0])
+            record.pop('_counted', None)
+            return record
         if self.client:
             result = self.client.table('upload_history').insert(upload_data).execute()
             if upload_data.get('channel_id'):
@@ -388,15 +748,28 @@ class DatabaseManager:
         if self.pg_dsn:
             return None
         if self.client:
-            result = self.client.table('video_analysis_cache').select("*").eq('video_file_hash', video_hash).execute()
-            if result.data:
-                cache_entry = result.data[0]
-                expires_at = datetime.fromisoformat(cache_entry['expires_at'])
-                if expires_at > datetime.now():
-                    return cache_entry
-            return None
-        # Memory
-        return self._mem_analysis_cache.get(video_hash)
+            cache_entry = self._analysis_cache.get(video_hash)
+            if cache_entry is None:
+                rows = await self._rest_select(
+                    'video_analysis_cache',
+                    {'select': '*', 'video_file_hash': f'eq.{video_hash}'}
+                )
+                if not rows:
+                    return None
+                cache_entry = rows[0]
+                # Parse the ISO expiry once; hits compare epoch floats
+                cache_entry['expires_at_ts'] = datetime.fromisoformat(
+                    cache_entry['expires_at']
+                ).timestamp()
+                self._analysis_cache[video_hash] = cache_entry
+        else:
+            # Memory
+            cache_entry = self._mem_analysis_cache.get(video_hash)
+            if cache_entry is None:
+                return None
+        if cache_entry['expires_at_ts'] > time.time():
+            return cache_entry
+        return None
     
     async def cache_analysis(self, video_hash: str, analysis_data: Dict[str, Any]) -> Dict[str, Any]:
         """Cache video analysis results"""
@@ -409,14 +782,21 @@ class DatabaseManager:
             'detected_category': analysis_data.get('category'),
             'keywords': analysis_data.get('keywords', []),
             'confidence_score': analysis_data.get('confidence', 0.0),
-            'expires_at': (datetime.now() + timedelta(days=7)).isoformat()
         }
+        expires_at_ts = time.time() + _ANALYSIS_TTL_SECONDS
+        cache_entry['expires_at'] = datetime.fromtimestamp(expires_at_ts).isoformat()
         if self.pg_dsn:
             return cache_entry
         if self.client:
-            result = self.client.table('video_analysis_cache').insert(cache_entry).execute()
-            return result.data[0] if result.data else None
+            rows = await self._rest_insert('video_analysis_cache', cache_entry)
+            if rows:
+                # expires_at_ts is process-local; the table only has expires_at
+                row = {**rows[0], 'expires_at_ts': expires_at_ts}
+                self._analysis_cache[video_hash] = row
+                return row
+            return None
         # Memory
+        cache_entry['expires_at_ts'] = expires_at_ts
         self._mem_analysis_cache[video_hash] = cache_entry
         return cache_entry
     
@@ -462,27 +842,26 @@ class DatabaseManager:
                     'newest': item['newest_item']
                 }
             return overview
-        # Memory
-        from collections import defaultdict
-        grouped = defaultdict(list)
-        for rec in self._mem_queue.values():
-            grouped[rec.get('status', 'pending')].append(rec)
-        overview = {}
-        for status, items in grouped.items():
-            items_sorted = sorted(items, key=lambda x: x.get('created_at', ''))
-            overview[status] = {
-                'count': len(items),
-                'oldest': items_sorted[0].get('created_at') if items_sorted else None,
-                'newest': items_sorted[-1].get('created_at') if items_sorted else None
+        # Memory: per-status lists are already sorted by created_at
+        return {
+            status: {
+                'count': len(bucket),
+                'oldest': bucket[0][0],
+                'newest': bucket[-1][0]
             }
-        return overview
+            for status, bucket in self._mem_by_status.items()
+            if bucket
+        }
 
 # Global database manager instance
 _db_manager: Optional[DatabaseManager] = None
+_db_manager_lock = threading.Lock()
 
 def get_db_manager() -> DatabaseManager:
     """Get or create global database manager"""
     global _db_manager
     if _db_manager is None:
-        _db_manager = DatabaseManager()
+        with _db_manager_lock:
+            if _db_manager is None:
+                _db_manager = DatabaseManager()
     return _db_manager
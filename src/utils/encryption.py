@@ -3,34 +3,84 @@ Encryption utilities for sensitive data
 """
 
 import base64
+import hashlib
+import os
+import threading
+from pathlib import Path
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from typing import Optional
+from typing import List, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger("encryption")
+
+# Values written before tokens were stored as-is were base64-encoded a second
+# time; a Fernet token always starts with "gAAAAA", which encodes to this
+_LEGACY_TOKEN_PREFIX = "Z0FBQUFB"
+
+def _to_token(ciphertext: str) -> bytes:
+    """Return the raw Fernet token for a stored (possibly legacy) value"""
+    if ciphertext.startswith(_LEGACY_TOKEN_PREFIX):
+        return base64.b64decode(ciphertext)
+    return ciphertext.encode('utf-8')
+
+def _derive_fernet_key(key: str) -> bytes:
+    """Stretch a 32-byte secret into a Fernet key (PBKDF2, ~50 ms)"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=b'stable_salt',  # In production, use random salt
+        iterations=100000,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(key.encode()))
+
+def _cached_fernet_key(key: str) -> bytes:
+    """
+    Return the derived Fernet key, reusing an on-disk copy across restarts.
+    The file lives under $XDG_CACHE_HOME/ugc with mode 0600 and is named by
+    a fingerprint of the secret, so rotating the key derives a fresh one.
+    """
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    fingerprint = hashlib.sha256(b'fernet-key:' + key.encode()).hexdigest()[:16]
+    path = Path(cache_home) / "ugc" / f"fernet-{fingerprint}.key"
+    try:
+        return path.read_bytes().strip()
+    except OSError:
+        pass
+    key_bytes = _derive_fernet_key(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key_bytes)
+        os.replace(tmp, path)
+    except OSError:
+        # Cache is best-effort; the derived key is still valid
+        pass
+    return key_bytes
 
 class EncryptionManager:
     """Manages encryption and decryption of sensitive data"""
     
-    def __init__(self, key: Optional[str] = None):
+    def __init__(self, key: Optional[str] = None, fernet_key: Optional[bytes] = None):
         """
         Initialize encryption manager
         
         Args:
             key: 32-byte encryption key or None to generate new
+            fernet_key: Already-derived Fernet key (skips key derivation)
         """
-        if key:
+        if fernet_key:
+            self.cipher = Fernet(fernet_key)
+        elif key:
             # Use provided key
             if len(key) != 32:
                 raise ValueError("Encryption key must be exactly 32 bytes")
             # Convert string key to Fernet key
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=b'stable_salt',  # In production, use random salt
-                iterations=100000,
-            )
-            key_bytes = base64.urlsafe_b64encode(kdf.derive(key.encode()))
-            self.cipher = Fernet(key_bytes)
+            self.cipher = Fernet(_derive_fernet_key(key))
         else:
             # Generate new key
             self.cipher = Fernet(Fernet.generate_key())
@@ -43,19 +93,18 @@ class EncryptionManager:
             plaintext: String to encrypt
             
         Returns:
-            Base64 encoded encrypted string
+            Fernet token (already URL-safe base64)
         """
         if not plaintext:
             return ""
-        encrypted = self.cipher.encrypt(plaintext.encode())
-        return base64.b64encode(encrypted).decode('utf-8')
+        return self.cipher.encrypt(plaintext.encode()).decode('utf-8')
     
     def decrypt(self, ciphertext: str) -> str:
         """
         Decrypt ciphertext string
         
         Args:
-            ciphertext: Base64 encoded encrypted string
+            ciphertext: Fernet token (legacy double-encoded values accepted)
             
         Returns:
             Decrypted plaintext string
@@ -63,9 +112,26 @@ class EncryptionManager:
         if not ciphertext:
             return ""
         try:
-            decoded = base64.b64decode(ciphertext.encode('utf-8'))
-            decrypted = self.cipher.decrypt(decoded)
-            return decrypted.decode('utf-8')
+            return self.cipher.decrypt(_to_token(ciphertext)).decode('utf-8')
+        except Exception as e:
+            raise ValueError(f"Decryption failed: {str(e)}")
+    
+    def decrypt_many(self, ciphertexts: List[str]) -> List[str]:
+        """
+        Decrypt a batch of ciphertext strings
+        
+        Args:
+            ciphertexts: Fernet tokens (legacy double-encoded values accepted)
+            
+        Returns:
+            Decrypted plaintext strings, in input order
+        """
+        decrypt = self.cipher.decrypt
+        try:
+            return [
+                decrypt(_to_token(c)).decode('utf-8') if c else ""
+                for c in ciphertexts
+            ]
         except Exception as e:
             raise ValueError(f"Decryption failed: {str(e)}")
     
@@ -105,18 +171,51 @@ class EncryptionManager:
                 except Exception as e:
                     # If decryption fails, keep the original value
                     # This handles cases where data was not encrypted
-                    print(f"Warning: Decryption failed for field {field}, keeping original value")
+                    logger.warning(f"Decryption failed for field {field}, keeping original value")
                     pass
         return result
+    
+    def decrypt_dicts(self, rows: List[dict], fields: list) -> List[dict]:
+        """
+        Decrypt specific fields across a list of dictionaries
+        
+        Args:
+            rows: Dictionaries containing encrypted data
+            fields: List of field names to decrypt
+            
+        Returns:
+            Copies of the rows with decrypted fields
+        """
+        results = [row.copy() for row in rows]
+        slots = [
+            (result, field)
+            for result in results
+            for field in fields
+            if result.get(field)
+        ]
+        try:
+            plaintexts = self.decrypt_many([str(r[f]) for r, f in slots])
+        except ValueError:
+            # Some values are not encrypted; fall back to per-field handling
+            return [self.decrypt_dict(row, fields) for row in rows]
+        for (result, field), plaintext in zip(slots, plaintexts):
+            result[field] = plaintext
+        return results
 
 # Global encryption manager instance
 _encryption_manager: Optional[EncryptionManager] = None
+_encryption_manager_lock = threading.Lock()
 
 def get_encryption_manager() -> EncryptionManager:
     """Get or create global encryption manager"""
     global _encryption_manager
     if _encryption_manager is None:
-        from src.config import settings
-        key = settings.encryption_key or "default_32_byte_key_for_testing!"
-        _encryption_manager = EncryptionManager(key)
+        with _encryption_manager_lock:
+            if _encryption_manager is None:
+                from src.config import settings
+                key = settings.encryption_key or "default_32_byte_key_for_testing!"
+                if settings.encryption_key_cache and len(key) == 32:
+                    _encryption_manager = EncryptionManager(fernet_key=_cached_fernet_key(key))
+                else:
+                    _encryption_manager = EncryptionManager(key)
     return _encryption_manager
\ No newline at end of file
@@ -0,0 +1,21 @@
+"""
+Event loop selection
+"""
+
+import asyncio
+
+def install_fast_event_loop() -> bool:
+    """
+    Use uvloop for asyncio.run() when it is available.
+    uvloop ships with uvicorn[standard] on Linux/macOS; elsewhere the default
+    loop is kept.
+    
+    Returns:
+        True if uvloop was installed
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
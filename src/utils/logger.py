@@ -7,6 +7,9 @@ from pathlib import Path
 from loguru import logger as _log
 from src.config import settings
 
+# Sinks are process-wide; register them only once
+_configured = False
+
 def setup_logger(name: str = "ugc_video_manager"):
     """
     Setup application logger with Loguru
@@ -17,6 +20,9 @@ def setup_logger(name: str = "ugc_video_manager"):
     Returns:
         Configured logger instance
     """
+    global _configured
+    if _configured:
+        return _log.bind(module=name)
     
     # Remove default handler
     _log.remove()
@@ -29,15 +35,19 @@ def setup_logger(name: str = "ugc_video_manager"):
         colorize=True
     )
     
-    # File handler for all logs
+    # File sinks write from loguru's background queue (enqueue=True) so the
+    # caller never blocks on disk I/O; rotated files are left uncompressed
+    # (zip compression ran inline on rotation) for logrotate/cron to handle
+    
+    # File handler for all logs (INFO chatter stays on the console)
     log_file = settings.log_folder_path / f"{name}.log"
     _log.add(
         log_file,
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        level="DEBUG",
-        rotation="10 MB",
+        level="DEBUG" if settings.debug_mode else "WARNING",
+        rotation="50 MB",
         retention="7 days",
-        compression="zip"
+        enqueue=True
     )
     
     # Error file handler
@@ -46,11 +56,13 @@ def setup_logger(name: str = "ugc_video_manager"):
         error_file,
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
         level="ERROR",
-        rotation="10 MB",
+        rotation="50 MB",
         retention="30 days",
-        compression="zip"
+        enqueue=True
     )
     
+    _configured = True
+    
     # Add context
     return _log.bind(module=name)
 
@@ -0,0 +1,396 @@
+"""
+Base Video Watcher Module
+Processing pipeline shared by the folder watchers
+"""
+
+import asyncio
+import hashlib
+import os
+from pathlib import Path
+from typing import Set, Optional, Callable, Dict, List, Tuple
+
+from cachetools import LRUCache
+from watchdog.events import FileSystemEventHandler
+
+from src.config import settings
+from src.utils.logger import get_logger
+from src.watchers.processed_store import ProcessedHashStore
+
+logger = get_logger("video_watcher")
+
+_INV_MB = 1.0 / (1024 * 1024)
+
+# Files waiting for a processing worker; events beyond this are dropped
+_QUEUE_MAXSIZE = 1024
+
+# A file must go this long without further events before it is processed
+_DEBOUNCE_SECONDS = 1.5
+
+def _stat_key(st: os.stat_result) -> Tuple[int, int, int, int]:
+    """Identity of a file's current contents that is cheap to compare"""
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+def _hash_range(fd: int, hasher, start: int, end: int) -> int:
+    """Feed bytes [start, end) of fd into hasher; returns how many were read"""
+    offset = start
+    while offset < end:
+        chunk = os.pread(fd, min(1 << 20, end - offset), offset)
+        if not chunk:
+            break
+        hasher.update(chunk)
+        offset += len(chunk)
+    return offset - start
+
+class BaseVideoFileHandler(FileSystemEventHandler):
+    """Per-path bookkeeping and the observer-thread handoff shared by the watchers"""
+    
+    def __init__(self, watcher: 'BaseVideoWatcher'):
+        self.watcher = watcher
+        self.processing_files: Set[str] = set()
+        self._quiet: Dict[str, asyncio.Event] = {}  # set while a path has no pending writes
+        self._pending: Dict[str, asyncio.TimerHandle] = {}  # per-path debounce timers
+    
+    def _schedule(
+        self,
+        file_path: str,
+        event_type: str,
+        channel_name: Optional[str] = None,
+        date_str: Optional[str] = None
+    ):
+        """Hand a video event from the observer thread to the event loop"""
+        # Coalesce the burst of modify events a copy produces (on the loop thread)
+        self.watcher.loop.call_soon_threadsafe(
+            self._debounce, file_path, event_type, channel_name, date_str
+        )
+    
+    def _debounce(
+        self,
+        file_path: str,
+        event_type: str,
+        channel_name: Optional[str],
+        date_str: Optional[str]
+    ):
+        """(Re)arm the quiet-period timer for a path; runs on the event loop"""
+        handle = self._pending.pop(file_path, None)
+        if handle:
+            handle.cancel()
+        quiet = self._quiet.get(file_path)
+        if quiet is not None:
+            quiet.clear()
+        self._pending[file_path] = self.watcher.loop.call_later(
+            _DEBOUNCE_SECONDS, self._dispatch, file_path, event_type, channel_name, date_str
+        )
+    
+    def _dispatch(
+        self,
+        file_path: str,
+        event_type: str,
+        channel_name: Optional[str],
+        date_str: Optional[str]
+    ):
+        """Schedule processing once a path has gone quiet"""
+        self._pending.pop(file_path, None)
+        self._quiet.setdefault(file_path, asyncio.Event()).set()
+        if file_path in self.processing_files:
+            return
+        
+        parent, name = os.path.split(file_path)
+        logger.info(f"Detected {event_type} video in {os.path.basename(parent)}: {name}")
+        
+        # Hand off to the watcher's bounded worker pool with channel info
+        try:
+            self.watcher.queue.put_nowait((file_path, channel_name, date_str))
+        except asyncio.QueueFull:
+            logger.warning(f"Watcher queue full, dropping {name} until its next change")
+            return
+        self.processing_files.add(file_path)
+    
+    def cancel_pending(self):
+        """Drop debounce timers that have not fired yet"""
+        for handle in self._pending.values():
+            handle.cancel()
+        self._pending.clear()
+    
+    def get_quiet_event(self, file_path: str) -> Optional[asyncio.Event]:
+        """Event that is set once the path has stopped receiving writes"""
+        return self._quiet.get(file_path)
+    
+    def release(self, file_path: str):
+        """Forget a path once the watcher is done with it"""
+        self.processing_files.discard(file_path)
+        self._quiet.pop(file_path, None)
+
+class BaseVideoWatcher:
+    """Size checks, file-ready wait, hashing and dedup for detected videos"""
+    
+    handler: BaseVideoFileHandler
+    
+    def __init__(self, watch_folder: str):
+        self.watch_folder = Path(watch_folder)
+        self.processed_files = ProcessedHashStore()  # raw SHA-256 digests, persisted
+        self._stat_keys: LRUCache = LRUCache(maxsize=200_000)  # stat identity -> digest
+        self.processing_callback: Optional[Callable] = None
+        self.is_running = False
+        self.loop: Optional[asyncio.AbstractEventLoop] = None  # set in _start_workers()
+        self.queue: Optional[asyncio.Queue] = None  # (file_path, channel_name, date_str)
+        self._workers: List[asyncio.Task] = []
+        self._video_exts = frozenset(ext.strip().lower() for ext in settings.get_video_extensions())
+        self._min_mb = settings.min_file_size_mb
+        self._max_mb = settings.max_file_size_mb
+    
+    def _start_workers(self):
+        """Bind to the running loop and start the bounded pool of pipeline workers"""
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=_QUEUE_MAXSIZE)
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(max(1, settings.watcher_concurrency))
+        ]
+    
+    async def _submit(
+        self,
+        file_path: str,
+        channel_name: Optional[str] = None,
+        date_str: Optional[str] = None
+    ) -> bool:
+        """
+        Queue a file found by a directory scan through the same gate as live
+        events: skipped while the path is in processing_files, claimed before
+        it is queued. Scans wait for queue room instead of dropping files.
+        """
+        processing = self.handler.processing_files
+        if file_path in processing:
+            return False
+        processing.add(file_path)
+        try:
+            await self.queue.put((file_path, channel_name, date_str))
+        except BaseException:
+            processing.discard(file_path)
+            raise
+        return True
+    
+    async def _stop_workers(self):
+        """Cancel pending debounce timers and the worker pool"""
+        self.handler.cancel_pending()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+    
+    async def _worker(self):
+        """Process queued videos one at a time"""
+        while True:
+            file_path, channel_name, date_str = await self.queue.get()
+            try:
+                await self.process_video(file_path, channel_name=channel_name, date_str=date_str)
+            finally:
+                self.queue.task_done()
+    
+    def _extract_metadata(self, path: Path) -> Tuple[Optional[str], Optional[str]]:
+        """(channel_name, date_str) for a video path; None where unknown"""
+        return None, None
+    
+    async def process_video(
+        self, 
+        file_path: str,
+        channel_name: Optional[str] = None,
+        date_str: Optional[str] = None
+    ):
+        """Process a detected video file with metadata"""
+        try:
+            path = Path(file_path)
+            if channel_name is None and date_str is None:
+                channel_name, date_str = self._extract_metadata(path)
+            st = path.stat()
+            
+            # Skip unchanged files we have already hashed and processed
+            if self._stat_keys.get(_stat_key(st)) in self.processed_files:
+                logger.info(f"File already processed: {path.name}")
+                return
+            
+            # Check file size
+            file_size_mb = st.st_size * _INV_MB
+            
+            if file_size_mb < self._min_mb:
+                logger.warning(f"File too small ({file_size_mb:.1f} MB): {path.name}")
+                return
+            
+            if file_size_mb > self._max_mb:
+                logger.warning(f"File too large ({file_size_mb:.1f} MB): {path.name}")
+                return
+            
+            # Wait for file to be fully written
+            st = await self._wait_for_file_ready(path, initial_size=st.st_size) or st
+            
+            # Calculate file hash, unless these exact contents were hashed before
+            key = _stat_key(st)
+            file_hash = self._stat_keys.get(key)
+            if file_hash is None:
+                file_hash = await asyncio.to_thread(self._calculate_file_hash, str(path))
+                self._stat_keys[key] = file_hash
+            
+            # Check if already processed
+            if file_hash in self.processed_files:
+                logger.info(f"File already processed: {path.name}")
+                return
+            
+            logger.info(
+                f"Processing video: {path.name} "
+                f"({file_size_mb:.1f} MB) "
+                f"[Channel: {channel_name}, Date: {date_str}]"
+            )
+            
+            # Create queue entry with metadata
+            succeeded = await self._create_queue_entry(
+                path, 
+                file_size_mb, 
+                file_hash.hex(),
+                channel_name=channel_name,
+                date_str=date_str
+            )
+            
+            # Mark as processed; failures stay eligible for a retry (the store persists)
+            if succeeded:
+                self.processed_files.add(file_hash)
+            
+            # Call custom callback if set
+            if self.processing_callback:
+                await self.processing_callback(file_path, channel_name, date_str)
+            
+        except Exception as e:
+            logger.error(f"Error processing video {file_path}: {e}")
+        finally:
+            # Every outcome (skipped, failed or done) frees the path for its next event
+            self.handler.release(file_path)
+    
+    async def _wait_for_file_ready(
+        self,
+        file_path: Path,
+        timeout: int = 30,
+        initial_size: int = -1
+    ) -> Optional[os.stat_result]:
+        """Wait for file to be fully written; returns the last stat taken"""
+        # Paths seen by the observer: sleep until the handler reports them quiet
+        quiet = self.handler.get_quiet_event(str(file_path))
+        if quiet is not None:
+            try:
+                await asyncio.wait_for(quiet.wait(), timeout)
+                return file_path.stat()
+            except asyncio.TimeoutError:
+                logger.warning(f"File not stable after {timeout} seconds: {file_path.name}")
+                return None
+            except OSError:
+                pass
+        
+        # Files found by a scan: poll the size until it stops changing
+        st = None
+        last_size = initial_size  # size from the caller's stat counts as the first sample
+        stable_count = 0
+        check_interval = 0.5
+        max_checks = int(timeout / check_interval)
+        
+        # Hash bytes as they land so a stable file needs no second read. Growth
+        # can hide a rewrite of an earlier region (muxers patch the header when
+        # they finalize), so a digest built from more than one range, or from a
+        # file that changed while it was read, is not trusted and process_video
+        # hashes the finished file instead.
+        hasher = hashlib.sha256()
+        hashed = 0
+        appended = False
+        hashed_key = None
+        last_mtime_ns = None
+        fd = None
+        if hasattr(os, "pread"):
+            try:
+                fd = os.open(file_path, os.O_RDONLY)
+            except OSError:
+                pass
+        
+        try:
+            for _ in range(max_checks):
+                await asyncio.sleep(check_interval)
+                try:
+                    st = file_path.stat()
+                    current_size = st.st_size
+                    
+                    if fd is not None:
+                        if current_size <= hashed and st.st_mtime_ns != last_mtime_ns:
+                            # Truncated or rewritten in place: start over
+                            hasher = hashlib.sha256()
+                            hashed = 0
+                            appended = False
+                        if current_size > hashed:
+                            appended = appended or hashed > 0
+                            hashed += await asyncio.to_thread(_hash_range, fd, hasher, hashed, current_size)
+                            # Same inode, size and mtime after the read: nothing moved under us
+                            unchanged = _stat_key(os.fstat(fd)) == _stat_key(st)
+                            hashed_key = _stat_key(st) if unchanged else None
+                        last_mtime_ns = st.st_mtime_ns
+                    
+                    if current_size == last_size:
+                        stable_count += 1
+                        if stable_count >= 3:  # File stable for 1.5 seconds
+                            if (
+                                fd is not None
+                                and hashed == current_size
+                                and not appended
+                                and hashed_key == _stat_key(st)
+                            ):
+                                self._stat_keys[_stat_key(st)] = hasher.digest()
+                            return st
+                    else:
+                        stable_count = 0
+                    
+                    last_size = current_size
+                    
+                except OSError:
+                    # File might be locked, wait and retry
+                    pass
+        finally:
+            if fd is not None:
+                os.close(fd)
+        
+        logger.warning(f"File not stable after {timeout} seconds: {file_path.name}")
+        return st
+    
+    def _calculate_file_hash(self, file_path: str) -> bytes:
+        """Calculate the raw SHA256 digest of file (hex only at the edges)"""
+        # file_digest runs the read/update loop in C with the GIL released
+        with open(file_path, "rb") as f:
+            if hasattr(os, "posix_fadvise"):
+                # One sequential pass: let the kernel read ahead aggressively
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            return hashlib.file_digest(f, "sha256").digest()
+    
+    async def _create_queue_entry(
+        self, 
+        file_path: Path, 
+        file_size_mb: float, 
+        file_hash: str,
+        channel_name: Optional[str] = None,
+        date_str: Optional[str] = None
+    ) -> bool:
+        """Create an entry in the upload queue with metadata; returns True on success"""
+        try:
+            # Trigger the full processing pipeline instead of just adding to queue
+            from src.processors.video_processor import get_video_processor
+            processor = get_video_processor()
+            
+            logger.info(f"Processing video through pipeline: {file_path.name}")
+
+            # Process video through complete pipeline, honoring folder channel hint if available
+            result = await processor.process_video(str(file_path), channel_hint=channel_name)
+            
+            if result.get("success"):
+                logger.info(f"Successfully processed: {file_path.name} (Queue ID: {result.get('queue_id')})")
+                return True
+            errors = result.get("errors", [])
+            logger.error(f"Failed to process {file_path.name}: {', '.join(errors)}")
+            return False
+                
+        except Exception as e:
+            logger.error(f"Error processing video: {e}")
+            return False
+    
+    def set_processing_callback(self, callback: Callable):
+        """Set a custom callback, called as callback(file_path, channel_name, date_str)"""
+        self.processing_callback = callback
@@ -4,31 +4,65 @@ Monitors subdirectories with date patterns for new video files
 """
 
 import asyncio
-import hashlib
-import re
+import time
 from pathlib import Path
-from typing import Set, Optional, Callable, Dict, List
-from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Tuple
 import os
 
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileModifiedEvent, DirCreatedEvent
+from watchdog.observers.polling import PollingObserver
 
 from src.config import settings
 from src.utils.logger import get_logger
 from src.utils.database import get_db_manager
+from src.watchers.base_watcher import BaseVideoFileHandler, BaseVideoWatcher, _stat_key
 
 logger = get_logger("enhanced_video_watcher")
 
-class EnhancedVideoFileHandler(FileSystemEventHandler):
+def _parse_folder(name: str) -> Optional[Tuple[str, str]]:
+    """Split a "채널명_날짜" folder name (e.g., "주부채널_0828") into (channel, date)"""
+    head, sep, tail = name.rpartition('_')
+    if head and len(tail) == 4 and tail.isdecimal():
+        return head, tail
+    return None
+
+# Filesystems whose changes the kernel notification APIs don't see
+_NETWORK_FS_TYPES = frozenset({
+    "nfs", "nfs4", "cifs", "smbfs", "smb3", "afs", "9p",
+    "fuse.sshfs", "fuse.rclone", "davfs", "fuse.davfs2",
+})
+_NETWORK_POLL_SECONDS = 10
+
+def _is_network_mount(path: Path) -> bool:
+    """Whether path lives on a network filesystem (Linux /proc/mounts only)"""
+    try:
+        target = os.path.realpath(path)
+        best, fstype = "", ""
+        with open("/proc/mounts") as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = fields[1].replace("\\040", " ")
+                if len(mount_point) > len(best) and (
+                    target == mount_point or target.startswith(mount_point.rstrip("/") + "/")
+                ):
+                    best, fstype = mount_point, fields[2]
+        return fstype in _NETWORK_FS_TYPES
+    except OSError:
+        return False
+
+def _make_observer(path: Path):
+    """Native kernel-event observer, or a slow poller on network mounts"""
+    if _is_network_mount(path):
+        logger.info(f"{path} is on a network filesystem; polling every {_NETWORK_POLL_SECONDS}s")
+        return PollingObserver(timeout=_NETWORK_POLL_SECONDS)
+    # watchdog's Observer is inotify / FSEvents / ReadDirectoryChangesW per platform
+    return Observer()
+
+class EnhancedVideoFileHandler(BaseVideoFileHandler):
     """Enhanced handler for video file events in subdirectories"""
     
-    def __init__(self, watcher: 'EnhancedVideoWatcher'):
-        self.watcher = watcher
-        self.processing_files: Set[str] = set()
-        # Pattern to match folders like "채널명_날짜" (e.g., "주부채널_0828")
-        self.folder_pattern = re.compile(r'^(.+)_(\d{4}|\d{2}\d{2})$')
-        
     def on_created(self, event):
         """Handle file/directory creation event"""
         if event.is_directory:
@@ -41,22 +75,43 @@ class EnhancedVideoFileHandler(FileSystemEventHandler):
         if not event.is_directory:
             self._handle_video_file(event.src_path, "modified")
     
+    def on_deleted(self, event):
+        """Drop deleted date folders from the index"""
+        if event.is_directory:
+            self._forget_directory(event.src_path)
+    
+    def on_moved(self, event):
+        """Re-key renamed/moved folders in the index"""
+        if event.is_directory:
+            self._forget_directory(event.src_path)
+            self._handle_new_directory(event.dest_path)
+    
+    def _forget_directory(self, dir_path: str):
+        """Remove a folder and any date folders below it from the index"""
+        prefix = dir_path.rstrip(os.sep) + os.sep
+        # Copy the keys: the loop thread may be adding folders concurrently
+        for path in list(self.watcher._date_folders):
+            if path == dir_path or path.startswith(prefix):
+                self.watcher._date_folders.pop(path, None)
+    
     def _handle_new_directory(self, dir_path: str):
         """Handle newly created directory"""
         dir_name = Path(dir_path).name
         
         # Check if it matches our date pattern
-        if self.folder_pattern.match(dir_name):
+        if _parse_folder(dir_name):
             logger.info(f"Detected new date folder: {dir_name}")
-            # Scan this directory for videos
-            asyncio.create_task(self.watcher.scan_directory(dir_path))
+            self.watcher._date_folders[dir_path] = time.time_ns()
+            # Scan this directory for videos (events arrive on the observer thread)
+            asyncio.run_coroutine_threadsafe(self.watcher.scan_directory(dir_path), self.watcher.loop)
     
     def _handle_video_file(self, file_path: str, event_type: str):
         """Process video file if valid and in correct folder structure"""
-        path = Path(file_path)
+        # Plain string ops: this runs for every write event during a copy
+        parent, name = os.path.split(file_path)
         
         # Check if it's a video file
-        if not settings.is_valid_video_file(path.name):
+        if os.path.splitext(name)[1].lower() not in self.watcher._video_exts:
             return
         
         # Skip if already processing
@@ -64,53 +119,36 @@ class EnhancedVideoFileHandler(FileSystemEventHandler):
             return
         
         # Skip temporary or hidden files
-        if path.name.startswith('.') or path.name.startswith('~'):
+        if name[:1] in ('.', '~'):
             return
         
         # Check if file is in a date-pattern folder
-        parent_folder = path.parent.name
-        if not self.folder_pattern.match(parent_folder):
+        grandparent, parent_folder = os.path.split(parent)
+        parsed = _parse_folder(parent_folder)
+        if not parsed:
             logger.debug(f"Skipping file not in date folder: {file_path}")
             return
         
-        logger.info(f"Detected {event_type} video in {parent_folder}: {path.name}")
-        
         # Extract channel info from folder name and prefer top-level folder as channel hint
-        match = self.folder_pattern.match(parent_folder)
-        if match:
-            channel_name = match.group(1)
-            date_str = match.group(2)
-            # Prefer the top-level channel folder if available (e.g., "2. 자취생 꿀템")
-            try:
-                top_folder = Path(file_path).parent.parent.name
-                if top_folder and top_folder not in ("", "."):
-                    channel_name = top_folder
-            except Exception:
-                pass
-            
-            # Add to processing queue with metadata
-            self.processing_files.add(file_path)
-            
-            # Schedule processing with channel info
-            asyncio.create_task(
-                self.watcher.process_video(
-                    file_path,
-                    channel_name=channel_name,
-                    date_str=date_str
-                )
-            )
+        channel_name, date_str = parsed
+        # Prefer the top-level channel folder if available (e.g., "2. 자취생 꿀템")
+        top_folder = os.path.basename(grandparent)
+        if top_folder and top_folder != ".":
+            channel_name = top_folder
+        
+        self._schedule(file_path, event_type, channel_name, date_str)
 
-class EnhancedVideoWatcher:
+class EnhancedVideoWatcher(BaseVideoWatcher):
     """Enhanced video watcher for hierarchical folder structure"""
     
     def __init__(self, watch_folder: str):
-        self.watch_folder = Path(watch_folder)
+        super().__init__(watch_folder)
         self.observers: Dict[str, Observer] = {}  # Multiple observers for subdirectories
         self.handler = EnhancedVideoFileHandler(self)
-        self.processed_files: Set[str] = set()
-        self.processing_callback: Optional[Callable] = None
-        self.is_running = False
         self.channel_folders: Dict[str, Path] = {}  # Map channel names to folders
+        # date folder path -> mtime (ns); the handler adds created/moved-in folders
+        # and drops deleted/moved-out ones
+        self._date_folders: Dict[str, int] = {}
         
         # Ensure watch folder exists
         if not self.watch_folder.exists():
@@ -127,6 +165,9 @@ class EnhancedVideoWatcher:
         
         self.is_running = True
         
+        # Bounded pool of pipeline workers fed by the event handler
+        self._start_workers()
+        
         # Scan for existing channel folders
         await self._discover_channel_folders()
         
@@ -141,33 +182,42 @@ class EnhancedVideoWatcher:
     async def _discover_channel_folders(self):
         """Discover channel folders in the watch directory"""
         try:
-            for item in self.watch_folder.iterdir():
-                if item.is_dir() and not item.name.startswith('.'):
-                    # This could be a channel folder
-                    self.channel_folders[item.name] = item
-                    logger.info(f"Discovered channel folder: {item.name}")
-                    # In debug mode, auto-create a basic channel record if none exists
-                    if settings.debug_mode:
-                        try:
-                            from src.utils.database import get_db_manager
-                            db = get_db_manager()
-                            existing = await db.get_available_channels()
-                            if not any(c.get('channel_name') == item.name for c in existing):
-                                await db.create_channel({
-                                    'channel_name': item.name,
-                                    'channel_url': f'https://youtube.com/@{item.name}',
-                                    'channel_type': 'main',
-                                    'parent_channel_id': None,
-                                    'category': 'lifestyle',
-                                    'description': 'Auto-created in debug mode from folder discovery',
-                                    'account_id': 'debug',
-                                    'account_password': 'debug',
-                                    'max_daily_uploads': settings.max_daily_uploads_per_channel,
-                                    'is_active': True,
-                                })
-                                logger.info(f"Auto-created channel in memory: {item.name}")
-                        except Exception as e:
-                            logger.warning(f"Channel auto-create skipped: {e}")
+            with os.scandir(self.watch_folder) as it:
+                entries = [e for e in it if e.is_dir(follow_symlinks=False) and not e.name.startswith('.')]
+            for entry in entries:
+                item = Path(entry.path)
+                # This could be a channel folder
+                self.channel_folders[item.name] = item
+                logger.info(f"Discovered channel folder: {item.name}")
+            
+            # In debug mode, auto-create a basic channel record for folders without one
+            if settings.debug_mode and entries:
+                try:
+                    db = get_db_manager()
+                    existing_names = {c.get('channel_name') for c in await db.get_available_channels()}
+                    missing = [e.name for e in entries if e.name not in existing_names]
+                    results = await asyncio.gather(*(
+                        db.create_channel({
+                            'channel_name': name,
+                            'channel_url': f'https://youtube.com/@{name}',
+                            'channel_type': 'main',
+                            'parent_channel_id': None,
+                            'category': 'lifestyle',
+                            'description': 'Auto-created in debug mode from folder discovery',
+                            'account_id': 'debug',
+                            'account_password': 'debug',
+                            'max_daily_uploads': settings.max_daily_uploads_per_channel,
+                            'is_active': True,
+                        })
+                        for name in missing
+                    ), return_exceptions=True)
+                    for name, result in zip(missing, results):
+                        if isinstance(result, Exception):
+                            logger.warning(f"Channel auto-create skipped for {name}: {result}")
+                        else:
+                            logger.info(f"Auto-created channel in memory: {name}")
+                except Exception as e:
+                    logger.warning(f"Channel auto-create skipped: {e}")
         except Exception as e:
             logger.error(f"Error discovering channel folders: {e}")
     
@@ -175,7 +225,7 @@ class EnhancedVideoWatcher:
         """Start observers for all directories"""
         try:
             # Main observer for root directory
-            main_observer = Observer()
+            main_observer = _make_observer(self.watch_folder)
             main_observer.schedule(
                 self.handler, 
                 str(self.watch_folder), 
@@ -198,20 +248,27 @@ class EnhancedVideoWatcher:
                 logger.info(f"Stopped observer: {name}")
             
             self.observers.clear()
+            
+            await self._stop_workers()
+            
             self.is_running = False
             logger.info("All observers stopped")
     
     async def _process_existing_files(self):
         """Process existing files in date-pattern folders"""
         try:
-            folder_pattern = re.compile(r'^(.+)_(\d{4}|\d{2}\d{2})$')
-            
             # Search through all channel folders
             for channel_folder in self.channel_folders.values():
-                for date_folder in channel_folder.iterdir():
-                    if date_folder.is_dir() and folder_pattern.match(date_folder.name):
-                        logger.info(f"Scanning existing date folder: {date_folder}")
-                        await self.scan_directory(str(date_folder))
+                with os.scandir(channel_folder) as it:
+                    date_folders = [
+                        e for e in it
+                        if e.is_dir(follow_symlinks=False) and _parse_folder(e.name)
+                    ]
+                for entry in date_folders:
+                    date_folder = entry.path
+                    self._date_folders[date_folder] = entry.stat().st_mtime_ns
+                    logger.info(f"Scanning existing date folder: {date_folder}")
+                    await self.scan_directory(date_folder)
             
         except Exception as e:
             logger.error(f"Error processing existing files: {e}")
@@ -220,175 +277,52 @@ class EnhancedVideoWatcher:
         """Scan a directory for video files"""
         try:
             dir_path = Path(directory_path)
-            folder_pattern = re.compile(r'^(.+)_(\d{4}|\d{2}\d{2})$')
-            
             # Extract channel info from folder name
             folder_name = dir_path.name
-            match = folder_pattern.match(folder_name)
+            parsed = _parse_folder(folder_name)
             
-            if not match:
+            if not parsed:
                 logger.debug(f"Folder doesn't match date pattern: {folder_name}")
                 return
             
             # Prefer top-level folder name as channel hint when present
-            channel_name = match.group(1)
+            channel_name, date_str = parsed
             try:
                 top_folder = dir_path.parent.name
                 if top_folder and top_folder not in ("", "."):
                     channel_name = top_folder
             except Exception:
                 pass
-            date_str = match.group(2)
             
-            # Scan for video files
-            for file_path in dir_path.iterdir():
-                if file_path.is_file() and settings.is_valid_video_file(file_path.name):
-                    # Check if not already processed
-                    file_hash = self._calculate_file_hash(str(file_path))
-                    if file_hash not in self.processed_files:
-                        logger.info(f"Found video in {folder_name}: {file_path.name}")
-                        await self.process_video(
-                            str(file_path),
-                            channel_name=channel_name,
-                            date_str=date_str
-                        )
+            # Scan for video files (name check first; DirEntry caches the file type)
+            video_exts = self._video_exts
+            with os.scandir(dir_path) as it:
+                entries = [
+                    e for e in it
+                    if e.name[:1] not in ('.', '~')
+                    and os.path.splitext(e.name)[1].lower() in video_exts
+                    and e.is_file()
+                ]
+            for entry in entries:
+                # Check if not already processed (hashing is left to process_video)
+                if self._stat_keys.get(_stat_key(entry.stat())) not in self.processed_files:
+                    # Same handoff as live events, so a file seen by both is processed once
+                    if await self._submit(entry.path, channel_name, date_str):
+                        logger.info(f"Found video in {folder_name}: {entry.name}")
                         
         except Exception as e:
             logger.error(f"Error scanning directory {directory_path}: {e}")
     
-    async def process_video(
-        self, 
-        file_path: str,
-        channel_name: Optional[str] = None,
-        date_str: Optional[str] = None
-    ):
-        """Process a detected video file with metadata"""
-        try:
-            path = Path(file_path)
-            
-            # Check file size
-            file_size_mb = path.stat().st_size / (1024 * 1024)
-            
-            if file_size_mb < settings.min_file_size_mb:
-                logger.warning(f"File too small ({file_size_mb:.1f} MB): {path.name}")
-                return
-            
-            if file_size_mb > settings.max_file_size_mb:
-                logger.warning(f"File too large ({file_size_mb:.1f} MB): {path.name}")
-                return
-            
-            # Wait for file to be fully written
-            await self._wait_for_file_ready(path)
-            
-            # Calculate file hash
-            file_hash = self._calculate_file_hash(str(path))
-            
-            # Check if already processed
-            if file_hash in self.processed_files:
-                logger.info(f"File already processed: {path.name}")
-                return
-            
-            logger.info(
-                f"Processing video: {path.name} "
-                f"({file_size_mb:.1f} MB) "
-                f"[Channel: {channel_name}, Date: {date_str}]"
-            )
-            
-            # Create queue entry with metadata
-            await self._create_queue_entry(
-                path, 
-                file_size_mb, 
-                file_hash,
-                channel_name=channel_name,
-                date_str=date_str
-            )
-            
-            # Mark as processed
-            self.processed_files.add(file_hash)
-            
-            # Remove from processing queue
-            if file_path in self.handler.processing_files:
-                self.handler.processing_files.remove(file_path)
-            
-            # Call custom callback if set
-            if self.processing_callback:
-                await self.processing_callback(file_path, channel_name, date_str)
-            
-        except Exception as e:
-            logger.error(f"Error processing video {file_path}: {e}")
-            # Remove from processing queue on error
-            if file_path in self.handler.processing_files:
-                self.handler.processing_files.remove(file_path)
-    
-    async def _wait_for_file_ready(self, file_path: Path, timeout: int = 30):
-        """Wait for file to be fully written"""
-        last_size = -1
-        stable_count = 0
-        check_interval = 0.5
-        max_checks = int(timeout / check_interval)
-        
-        for _ in range(max_checks):
-            try:
-                current_size = file_path.stat().st_size
-                
-                if current_size == last_size:
-                    stable_count += 1
-                    if stable_count >= 3:  # File stable for 1.5 seconds
-                        return
-                else:
-                    stable_count = 0
-                
-                last_size = current_size
-                await asyncio.sleep(check_interval)
-                
-            except OSError:
-                # File might be locked, wait and retry
-                await asyncio.sleep(check_interval)
-        
-        logger.warning(f"File not stable after {timeout} seconds: {file_path.name}")
-    
-    def _calculate_file_hash(self, file_path: str) -> str:
-        """Calculate SHA256 hash of file"""
-        sha256_hash = hashlib.sha256()
-        
-        with open(file_path, "rb") as f:
-            # Read in chunks for large files
-            for byte_block in iter(lambda: f.read(65536), b""):
-                sha256_hash.update(byte_block)
-        
-        return sha256_hash.hexdigest()
-    
-    async def _create_queue_entry(
-        self, 
-        file_path: Path, 
-        file_size_mb: float, 
-        file_hash: str,
-        channel_name: Optional[str] = None,
-        date_str: Optional[str] = None
-    ):
-        """Create an entry in the upload queue with metadata"""
-        try:
-            # Trigger the full processing pipeline instead of just adding to queue
-            from src.processors.video_processor import get_video_processor
-            processor = get_video_processor()
-            
-            logger.info(f"Processing video through pipeline: {file_path.name}")
-
-            # Process video through complete pipeline, honoring folder channel hint if available
-            result = await processor.process_video(str(file_path), channel_hint=channel_name)
-            
-            if result.get("success"):
-                logger.info(f"Successfully processed: {file_path.name} (Queue ID: {result.get('queue_id')})")
-            else:
-                errors = result.get("errors", [])
-                logger.error(f"Failed to process {file_path.name}: {', '.join(errors)}")
-                
-        except Exception as e:
-            logger.error(f"Error processing video: {e}")
-    
-    def set_processing_callback(self, callback: Callable):
-        """Set a custom callback for when a video is processed"""
-        self.processing_callback = callback
+    def _extract_metadata(self, path: Path) -> Tuple[Optional[str], Optional[str]]:
+        """Channel and date from a "채널명_날짜" parent, preferring the top-level folder"""
+        parsed = _parse_folder(path.parent.name)
+        if not parsed:
+            return None, None
+        channel_name, date_str = parsed
+        top_folder = path.parent.parent.name
+        if top_folder and top_folder != ".":
+            channel_name = top_folder
+        return channel_name, date_str
     
     def get_stats(self) -> dict:
         """Get watcher statistics"""
@@ -398,30 +332,15 @@ class EnhancedVideoWatcher:
             "channel_folders": len(self.channel_folders),
             "observers": len(self.observers),
             "processed_files": len(self.processed_files),
-            "currently_processing": len(self.handler.processing_files) if self.handler else 0
+            "currently_processing": len(self.handler.processing_files) if self.handler else 0,
+            "queued": self.queue.qsize() if self.queue else 0
         }
     
     def get_recent_folders(self, days: int = 7) -> List[Path]:
-        """Get folders created in the last N days"""
-        recent_folders = []
-        folder_pattern = re.compile(r'^(.+)_(\d{4}|\d{2}\d{2})$')
-        cutoff_time = datetime.now() - timedelta(days=days)
-        
-        try:
-            for channel_folder in self.channel_folders.values():
-                for date_folder in channel_folder.iterdir():
-                    if date_folder.is_dir() and folder_pattern.match(date_folder.name):
-                        # Check folder creation time
-                        folder_stat = date_folder.stat()
-                        folder_mtime = datetime.fromtimestamp(folder_stat.st_mtime)
-                        
-                        if folder_mtime > cutoff_time:
-                            recent_folders.append(date_folder)
-            
-        except Exception as e:
-            logger.error(f"Error getting recent folders: {e}")
-        
-        return recent_folders
+        """Get folders created in the last N days (from the in-memory index)"""
+        cutoff_ns = time.time_ns() - days * 86_400_000_000_000
+        # Copy first: the observer thread may add folders concurrently
+        return [Path(p) for p, mtime_ns in list(self._date_folders.items()) if mtime_ns > cutoff_ns]
 
 # Standalone function for testing
 async def watch_folder_enhanced(folder_path: str):
@@ -0,0 +1,53 @@
+"""
+Processed Video Store
+Remembers which video contents have been processed, across restarts
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from cachetools import LRUCache
+
+from src.config import settings
+
+class ProcessedHashStore:
+    """Set-like store of raw SHA-256 digests: bounded LRU in front of SQLite"""
+
+    def __init__(self, db_path: Optional[Path] = None, maxsize: int = 200_000):
+        self._recent: LRUCache = LRUCache(maxsize=maxsize)
+        self.db_path = Path(db_path or settings.temp_folder_path / "processed_hashes.db")
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Autocommit; every access happens on the event loop thread
+        self._conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed_hashes "
+            "(hash BLOB PRIMARY KEY, first_seen INTEGER NOT NULL)"
+        )
+
+    def __contains__(self, digest) -> bool:
+        if not isinstance(digest, bytes):
+            return False
+        if digest in self._recent:
+            return True
+        row = self._conn.execute(
+            "SELECT 1 FROM processed_hashes WHERE hash = ?", (digest,)
+        ).fetchone()
+        if row:
+            self._recent[digest] = True
+        return row is not None
+
+    def add(self, digest: bytes):
+        """Mark a digest as processed"""
+        self._recent[digest] = True
+        self._conn.execute(
+            "INSERT OR IGNORE INTO processed_hashes (hash, first_seen) VALUES (?, ?)",
+            (digest, int(time.time()))
+        )
+
+    def __len__(self) -> int:
+        """Number of digests on disk, not just the ones cached in memory"""
+        return self._conn.execute("SELECT COUNT(*) FROM processed_hashes").fetchone()[0]
@@ -9,7 +9,19 @@ from dotenv import load_dotenv
 
 # Load test environment variables
 TEST_ENV_PATH = Path(__file__).parent.parent / '.env.test'
-load_dotenv(TEST_ENV_PATH)
+_LOADED = False
+
+def _load_once():
+    """Parse .env.test at most once per process"""
+    global _LOADED
+    if not _LOADED:
+        # CI may not ship .env.test; variables already in the environment win
+        if TEST_ENV_PATH.is_file():
+            load_dotenv(TEST_ENV_PATH, override=False)
+        _LOADED = True
+
+# TestConfig reads the environment at class creation, so load before it
+_load_once()
 
 class TestConfig:
     """Test environment configuration"""
@@ -53,19 +65,34 @@ class TestConfig:
     API_TIMEOUT = 30  # seconds
     DB_TIMEOUT = 10  # seconds
     
+    _initialized = False
+    
     @classmethod
     def setup_test_environment(cls):
-        """Create necessary test directories"""
-        cls.TEST_VIDEO_DIR.mkdir(parents=True, exist_ok=True)
-        cls.TEST_TEMP_DIR.mkdir(parents=True, exist_ok=True)
-        cls.TEST_REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-        (cls.TEST_REPORTS_DIR / 'coverage').mkdir(exist_ok=True)
-        (cls.TEST_REPORTS_DIR / 'performance').mkdir(exist_ok=True)
+        """Create necessary test directories (once per process)"""
+        if cls._initialized:
+            return
+        # Leaf directories only; parents=True creates the reports parent
+        for path in (
+            cls.TEST_VIDEO_DIR,
+            cls.TEST_TEMP_DIR,
+            cls.TEST_REPORTS_DIR / 'coverage',
+            cls.TEST_REPORTS_DIR / 'performance',
+        ):
+            path.mkdir(parents=True, exist_ok=True)
+        cls._initialized = True
     
     @classmethod
     def cleanup_test_environment(cls):
         """Clean up test files and directories"""
         import shutil
-        if cls.TEST_TEMP_DIR.exists():
-            shutil.rmtree(cls.TEST_TEMP_DIR)
-        cls.TEST_TEMP_DIR.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+        if not cls.TEST_TEMP_DIR.is_dir():
+            cls.TEST_TEMP_DIR.mkdir(parents=True, exist_ok=True)
+            return
+        # Empty the directory in place rather than deleting and recreating it
+        with os.scandir(cls.TEST_TEMP_DIR) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
\ No newline at end of file
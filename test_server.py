@@ -6,6 +6,7 @@ Simple test server to verify installation
 print("Starting test server...")
 
 try:
+    import asyncio
     from fastapi import FastAPI
     import uvicorn
     
@@ -19,8 +20,16 @@ try:
     print("Starting server on http://localhost:8000")
     print("Press Ctrl+C to stop")
     
-    # Run server
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Run server (per-request access logs off)
+    config = uvicorn.Config(
+        app=app,
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio",
+        log_level="warning"
+    )
+    server = uvicorn.Server(config)
+    asyncio.run(server.serve())
     
 except ImportError as e:
     print(f"Error: {e}")
@@ -1,74 +1,103 @@
 #!/usr/bin/env python3
 """
 Test script to debug startup issues
+Run with --verbose to see each step; failures are always reported
 """
 
+import asyncio
+import hashlib
+import logging
 import sys
 import os
+from pathlib import Path
 
-print("Python version:", sys.version)
-print("Current directory:", os.getcwd())
-print("Python path:", sys.path[:3])
+logging.basicConfig(
+    level=logging.INFO if "--verbose" in sys.argv else logging.WARNING,
+    format="%(message)s"
+)
+log = logging.getLogger(__name__)
 
-# Test imports one by one
-try:
-    print("\n1. Testing basic imports...")
-    import asyncio
-    print("✅ asyncio imported")
+log.info("Python version: %s", sys.version)
+log.info("Current directory: %s", os.getcwd())
+log.info("Python path: %s", sys.path[:3])
+
+ROOT = Path(__file__).resolve().parent
+PROBE_CACHE = ROOT / ".pytest_cache" / "startup_probe"
+
+def _probe_key():
+    """Fingerprint of requirements and sources, from mtimes only"""
+    files = [ROOT / "requirements.txt", *sorted((ROOT / "src").rglob("*.py"))]
+    digest = hashlib.sha1()
+    for path in files:
+        try:
+            digest.update(f"{path}:{path.stat().st_mtime_ns}\n".encode())
+        except FileNotFoundError:
+            continue
+    return digest.hexdigest()
+
+def probe():
+    """Import the startup modules one by one, skipping if nothing changed since the last good run"""
+    key = _probe_key()
+    try:
+        if PROBE_CACHE.read_text(errors="ignore") == key:
+            log.info("\n1-5. Imports unchanged since last successful probe, skipping")
+            return
+    except FileNotFoundError:
+        pass
     
+    log.info("\n1. Testing basic imports...")
     import signal
-    print("✅ signal imported")
-    
-    from pathlib import Path
-    print("✅ Path imported")
-    
-    print("\n2. Testing project imports...")
-    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    log.info("✅ signal imported")
     
+    log.info("\n2. Testing project imports...")
     from src.config import settings
-    print("✅ settings imported")
-    print(f"   - Debug mode: {settings.debug_mode}")
-    print(f"   - API port: {settings.api_port}")
+    log.info("✅ settings imported")
+    log.info(f"   - Debug mode: {settings.debug_mode}")
+    log.info(f"   - API port: {settings.api_port}")
     
-    print("\n3. Testing API imports...")
+    log.info("\n3. Testing API imports...")
     from src.api.main import create_app, start_server
-    print("✅ API imports successful")
+    log.info("✅ API imports successful")
     
-    print("\n4. Testing video watcher imports...")
+    log.info("\n4. Testing video watcher imports...")
     from src.watchers.video_watcher import VideoWatcher
-    print("✅ VideoWatcher imported")
+    log.info("✅ VideoWatcher imported")
     
-    print("\n5. Testing logger...")
+    log.info("\n5. Testing logger...")
     from src.utils.logger import setup_logger
-    logger = setup_logger("test")
-    print("✅ Logger setup successful")
+    setup_logger("test")
+    log.info("✅ Logger setup successful")
+    
+    PROBE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    PROBE_CACHE.write_text(key)
+
+# Test imports one by one
+try:
+    sys.path.insert(0, str(ROOT))
+    probe()
     
-    print("\n6. Running minimal async test...")
+    log.info("\n6. Running minimal async test...")
     async def test_async():
-        print("   Async function running...")
+        log.info("   Async function running...")
         await asyncio.sleep(0.1)
-        print("   Async function completed")
+        log.info("   Async function completed")
         return True
     
     result = asyncio.run(test_async())
-    print(f"✅ Async test result: {result}")
+    log.info(f"✅ Async test result: {result}")
     
-    print("\n✅ ALL TESTS PASSED!")
-    print("\nNow testing main function...")
+    log.info("\n✅ ALL TESTS PASSED!")
+    log.info("\nNow testing main function...")
     
     # Import main function
     from main import main
-    print("✅ Main function imported")
+    log.info("✅ Main function imported")
     
     # Try to run main
-    print("\nAttempting to run main()...")
+    log.info("\nAttempting to run main()...")
     asyncio.run(main())
     
 except ImportError as e:
-    print(f"❌ Import error: {e}")
-    import traceback
-    traceback.print_exc()
+    log.exception(f"❌ Import error: {e}")
 except Exception as e:
-    print(f"❌ Error: {e}")
-    import traceback
-    traceback.print_exc()
\ No newline at end of file
+    log.exception(f"❌ Error: {e}")
@@ -2,48 +2,60 @@
 Pytest configuration and fixtures
 """
 
+import os
 import pytest
-import asyncio
-import tempfile
-from pathlib import Path
-from unittest.mock import MagicMock, AsyncMock
-import sys
+import shutil
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+@pytest.fixture(scope="session")
+def _sample_video(tmp_path_factory):
+    """Mock video payload, written once per session"""
+    path = tmp_path_factory.mktemp("sample") / "sample.mp4"
+    path.write_bytes(b"mock video content")
+    return path
 
 @pytest.fixture
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-@pytest.fixture
-def temp_dir():
+def temp_dir(tmp_path):
     """Create a temporary directory for test files"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    target = tmp_path / "files"
+    target.mkdir()
+    return target
 
 @pytest.fixture
-def mock_video_file(temp_dir):
-    """Create a mock video file"""
+def mock_video_file(_sample_video, temp_dir):
+    """Create a mock video file (a hardlink to the session sample where possible)"""
     video_path = temp_dir / "test_video.mp4"
-    video_path.write_bytes(b"mock video content")
+    try:
+        os.link(_sample_video, video_path)
+    except OSError:
+        shutil.copy(_sample_video, video_path)
     return video_path
 
+@pytest.fixture(scope="session")
+def settings():
+    """Application settings (imported on first use)"""
+    from src.config import settings as app_settings
+    return app_settings
+
+async def _always_true(*args, **kwargs):
+    return True
+
+async def _empty_result(*args, **kwargs):
+    return SimpleNamespace(data=[])
+
 @pytest.fixture
 def mock_db_manager():
     """Create a mock database manager"""
-    mock_db = AsyncMock()
-    mock_db.test_connection = AsyncMock(return_value=True)
-    mock_db.execute_query = AsyncMock(return_value=MagicMock(data=[]))
+    mock_db = MagicMock()
+    mock_db.test_connection = _always_true
+    mock_db.execute_query = _empty_result
     return mock_db
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_analysis_result():
-    """Create a mock video analysis result"""
-    return {
+    """Create a mock video analysis result (shared, read-only)"""
+    return MappingProxyType({
         "products": [
             {"name": "테스트 제품", "brand": "테스트 브랜드"}
         ],
@@ -52,38 +64,38 @@ def mock_analysis_result():
         "content_type": "review",
         "confidence_score": 0.85,
         "summary": "테스트 영상 분석 결과"
-    }
+    })
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_seo_content():
-    """Create mock SEO content"""
-    return {
+    """Create mock SEO content (shared, read-only)"""
+    return MappingProxyType({
         "title": "테스트 제품 리뷰 | 2025년 최신",
         "description": "테스트 제품에 대한 상세 리뷰입니다.",
         "tags": ["테스트", "제품", "리뷰"],
         "thumbnail": None
-    }
+    })
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_channel_info():
-    """Create mock channel information"""
-    return {
+    """Create mock channel information (shared, read-only)"""
+    return MappingProxyType({
         "channel_id": "test_channel_001",
         "channel_name": "테스트 채널",
         "uploads_today": 0,
         "category_match": 0.8,
         "reason": "카테고리 매칭"
-    }
+    })
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_product_matches():
-    """Create mock product matches"""
-    return [
-        {
+    """Create mock product matches (shared, read-only)"""
+    return (
+        MappingProxyType({
             "product_name": "테스트 제품",
             "coupang_url": "https://link.coupang.com/test",
             "image_url": "https://example.com/image.jpg",
             "price": "₩50,000",
             "confidence": 0.9
-        }
-    ]
\ No newline at end of file
+        }),
+    )
\ No newline at end of file
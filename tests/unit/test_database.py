@@ -0,0 +1,141 @@
+"""
+Unit tests for the database layer
+"""
+
+import os
+import uuid
+
+import httpx
+import pytest
+
+from src.utils.database import (
+    DatabaseManager,
+    _init_connection,
+    _jsonb_decode,
+    _jsonb_encode,
+)
+
+# Postgres used by the live tests; they are skipped when it is not set
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+class _CodecRecorder:
+    """Stands in for an asyncpg connection and records set_type_codec calls"""
+
+    def __init__(self):
+        self.codecs = {}
+
+    async def set_type_codec(self, typename, **kwargs):
+        self.codecs[typename] = kwargs
+
+async def test_jsonb_codec_is_binary():
+    """COPY only accepts binary encoders, so jsonb must be registered as binary"""
+    conn = _CodecRecorder()
+    await _init_connection(conn)
+    assert conn.codecs["jsonb"]["format"] == "binary"
+
+def test_jsonb_codec_round_trip():
+    value = {"links": [{"url": "https://example.com", "rank": 1}], "note": "테스트"}
+    encoded = _jsonb_encode(value)
+    assert encoded[:1] == b"\x01"
+    assert _jsonb_decode(encoded) == value
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+async def test_add_many_to_queue_copies_jsonb():
+    """The COPY batch path encodes jsonb columns through the registered codec"""
+    db = DatabaseManager()
+    db.pg_dsn = TEST_DATABASE_URL
+    try:
+        async with db.transaction():
+            # Temp table shadows upload_queue on the transaction's connection
+            await db.execute_query(
+                "CREATE TEMP TABLE upload_queue "
+                "(id UUID PRIMARY KEY, title TEXT, infocrlink_data JSONB) ON COMMIT DROP"
+            )
+            items = [
+                {"id": str(uuid.uuid4()), "title": "a", "infocrlink_data": {"links": [1, 2]}},
+                {"id": str(uuid.uuid4()), "title": "b", "infocrlink_data": None},
+            ]
+            assert await db.add_many_to_queue(items) == items
+
+            result = await db.execute_query(
+                "SELECT title, infocrlink_data FROM upload_queue ORDER BY title"
+            )
+            assert result.data == [
+                {"title": "a", "infocrlink_data": {"links": [1, 2]}},
+                {"title": "b", "infocrlink_data": None},
+            ]
+    finally:
+        await db.close()
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+async def test_update_channel_keeps_omitted_and_clears_none():
+    """Omitted fields keep their value, fields passed as None become NULL"""
+    db = DatabaseManager()
+    db.pg_dsn = TEST_DATABASE_URL
+    try:
+        async with db.transaction():
+            await db.execute_query(
+                "CREATE TEMP TABLE youtube_channels ("
+                "id TEXT PRIMARY KEY, channel_name TEXT, channel_url TEXT, channel_type TEXT, "
+                "parent_channel_id UUID, category TEXT, description TEXT, account_id TEXT, "
+                "account_password TEXT, max_daily_uploads INTEGER, is_active BOOLEAN, "
+                "infocrlink_url TEXT, updated_at TIMESTAMPTZ) ON COMMIT DROP"
+            )
+            await db.execute_query(
+                "INSERT INTO youtube_channels (id, channel_name, description, category) "
+                "VALUES ('c1', 'old', 'some text', 'tech')"
+            )
+            rec = await db.update_channel("c1", {"channel_name": "new", "description": None})
+            assert rec["channel_name"] == "new"
+            assert rec["description"] is None
+            assert rec["category"] == "tech"
+    finally:
+        await db.close()
+
+async def test_update_channel_rejects_unknown_fields():
+    db = DatabaseManager()
+    with pytest.raises(ValueError, match="not_a_column"):
+        await db.update_channel("c1", {"not_a_column": 1})
+
+@pytest.fixture
+def memory_db():
+    """DatabaseManager on its in-memory fallback store"""
+    db = DatabaseManager()
+    db.pg_dsn = None
+    db.client = None
+    return db
+
+async def test_memory_pending_order_matches_sql(memory_db):
+    """Retried items keep their created_at position within a priority, like the SQL path"""
+    older = await memory_db.add_to_queue(
+        {"id": "older", "priority": 50, "created_at": "2024-01-01T00:00:00"}
+    )
+    await memory_db.add_to_queue(
+        {"id": "newer", "priority": 50, "created_at": "2024-01-01T00:00:01"}
+    )
+    await memory_db.add_to_queue(
+        {"id": "urgent", "priority": 90, "created_at": "2024-01-01T00:00:02"}
+    )
+
+    # Fail and re-pend the older item; it must not move behind "newer"
+    await memory_db.update_queue_item(older["id"], {"status": "failed"})
+    await memory_db.update_queue_item(older["id"], {"status": "pending"})
+
+    order = [(await memory_db.pop_next_pending())["id"] for _ in range(3)]
+    assert order == ["urgent", "older", "newer"]
+    assert await memory_db.pop_next_pending() is None
+
+async def test_memory_list_channels_returns_copies(memory_db):
+    channel = await memory_db.create_channel({"channel_name": "c1", "category": "tech"})
+    listed = await memory_db.list_channels_all()
+    listed[0]["category"] = "changed"
+    assert (await memory_db.get_channel(channel["id"]))["category"] == "tech"
+
+async def test_close_releases_http_client():
+    db = DatabaseManager()
+    db._http = httpx.AsyncClient()
+    http = db._http
+    await db.close()
+    assert http.is_closed
+    assert db._http is None and db.pool is None
+    await db.close()
@@ -0,0 +1,40 @@
+"""
+Unit tests for the queue manager
+"""
+
+import os
+
+import pytest
+
+from src.queue.queue_manager import _new_queue_id, _stat_sizes
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_queue_ids_differ_across_fork():
+    """A forked worker must not repeat the parent's queue IDs"""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        os.write(write_fd, _new_queue_id().bytes)
+        os._exit(0)
+    os.close(write_fd)
+    child_id = os.read(read_fd, 16)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    assert child_id != _new_queue_id().bytes
+
+def test_stat_sizes_skips_unreadable_paths(tmp_path, monkeypatch):
+    """One path that cannot be stat'ed must not sink the rest of the batch"""
+    readable = tmp_path / "a.mp4"
+    readable.write_bytes(b"x" * 10)
+    blocked = str(tmp_path / "blocked.mp4")
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        if os.fspath(path) == blocked:
+            raise PermissionError(13, "Permission denied", blocked)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", stat)
+    sizes = _stat_sizes([str(readable), blocked, str(tmp_path / "missing.mp4")])
+    assert sizes == [10, None, None]
@@ -0,0 +1,172 @@
+"""
+Unit tests for the video watcher pipeline
+"""
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from src.watchers.base_watcher import BaseVideoFileHandler, BaseVideoWatcher, _stat_key
+from src.watchers.processed_store import ProcessedHashStore
+
+@pytest.fixture
+def watcher(tmp_path):
+    """BaseVideoWatcher with its own hash store and no size limits"""
+    w = BaseVideoWatcher(str(tmp_path))
+    w.processed_files = ProcessedHashStore(tmp_path / "processed_hashes.db")
+    w.handler = BaseVideoFileHandler(w)
+    w._min_mb = 0
+    w._max_mb = float("inf")
+
+    async def ready(path, timeout=30, initial_size=-1):
+        return path.stat()
+
+    w._wait_for_file_ready = ready
+    return w
+
+@pytest.mark.parametrize("succeeded", [True, False])
+async def test_only_successful_entries_are_marked_processed(watcher, tmp_path, succeeded):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"video bytes")
+
+    async def create_queue_entry(*args, **kwargs):
+        return succeeded
+
+    watcher._create_queue_entry = create_queue_entry
+    await watcher.process_video(str(video))
+    assert len(watcher.processed_files) == (1 if succeeded else 0)
+
+async def test_skipped_files_are_released(watcher, tmp_path):
+    """Early returns (here: too small) must free the path for its next event"""
+    video = tmp_path / "partial.mp4"
+    video.write_bytes(b"x")
+    watcher._min_mb = 1
+    watcher.handler.processing_files.add(str(video))
+    watcher.handler._quiet[str(video)] = asyncio.Event()
+
+    await watcher.process_video(str(video))
+    assert str(video) not in watcher.handler.processing_files
+    assert watcher.handler.get_quiet_event(str(video)) is None
+
+def test_processed_store_counts_persisted_digests(tmp_path):
+    db_path = tmp_path / "processed_hashes.db"
+    ProcessedHashStore(db_path).add(b"\x01" * 32)
+
+    reopened = ProcessedHashStore(db_path)
+    assert len(reopened) == 1
+    assert b"\x01" * 32 in reopened
+
+def _append(path, data):
+    with open(path, "ab") as f:
+        f.write(data)
+
+def _rewrite_head_and_append(path, head, tail):
+    """What an MP4 muxer does when it finalizes: patch the header and grow"""
+    with open(path, "r+b") as f:
+        f.write(head)
+        f.seek(0, 2)
+        f.write(tail)
+
+def _truncate(path, size):
+    with open(path, "r+b") as f:
+        f.truncate(size)
+
+def _rewrite_same_size(path, data):
+    with open(path, "r+b") as f:
+        f.write(data)
+
+@pytest.mark.parametrize("mutate", [
+    None,
+    lambda p: _append(p, b"B" * 4096),
+    lambda p: _rewrite_head_and_append(p, b"moov", b"C" * 4096),
+    lambda p: _truncate(p, 1000),
+    lambda p: _rewrite_same_size(p, b"HEAD"),
+], ids=["stable", "append", "rewrite-and-grow", "truncate", "rewrite-in-place"])
+async def test_incremental_digest_matches_final_contents(watcher, tmp_path, monkeypatch, mutate):
+    """The digest cached while waiting is either absent or the hash of the finished file"""
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"A" * 8192)
+    del watcher._wait_for_file_ready  # use the real polling wait
+
+    # Change the file between the first and second polls; no real sleeping
+    polls = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay):
+        polls.append(delay)
+        if len(polls) == 2 and mutate is not None:
+            mutate(video)
+            # Coarse filesystem timestamps would hide the write from the watcher
+            st = video.stat()
+            os.utime(video, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    st = await watcher._wait_for_file_ready(video)
+
+    assert st is not None and st.st_size == video.stat().st_size
+    digest = watcher._stat_keys.get(_stat_key(st))
+    expected = hashlib.sha256(video.read_bytes()).digest()
+    if mutate is None:
+        assert digest == expected
+    else:
+        assert digest in (None, expected)
+
+async def test_video_watcher_processes_live_events(tmp_path, monkeypatch):
+    """Observer-thread events reach the worker pool through the shared handoff"""
+    from src.watchers import base_watcher
+    from src.watchers.video_watcher import VideoWatcher
+
+    monkeypatch.setattr(base_watcher, "_DEBOUNCE_SECONDS", 0.05)
+    watch_dir = tmp_path / "watch"
+    w = VideoWatcher(str(watch_dir))
+    w.processed_files = ProcessedHashStore(tmp_path / "processed_hashes.db")
+    w._min_mb = 0
+    processed = asyncio.Event()
+
+    async def create_queue_entry(*args, **kwargs):
+        processed.set()
+        return True
+
+    w._create_queue_entry = create_queue_entry
+    await w.start()
+    try:
+        (watch_dir / "clip.mp4").write_bytes(b"video bytes")
+        await asyncio.wait_for(processed.wait(), 10)
+    finally:
+        await w.stop()
+    assert len(w.processed_files) == 1
+    assert not w.handler.processing_files
+
+async def test_scan_and_event_share_one_handoff(watcher, tmp_path):
+    """A file found by both a scan and a live event is queued once"""
+    watcher.loop = asyncio.get_running_loop()
+    watcher.queue = asyncio.Queue()
+    path = str(tmp_path / "clip.mp4")
+
+    assert await watcher._submit(path, "채널", "0828")
+    watcher.handler._dispatch(path, "created", "채널", "0828")
+    assert not await watcher._submit(path, "채널", "0828")
+
+    assert watcher.queue.qsize() == 1
+    assert path in watcher.handler.processing_files
+
+def test_date_folder_index_follows_deletes_and_moves(tmp_path):
+    from watchdog.events import DirDeletedEvent, DirMovedEvent
+
+    from src.watchers.enhanced_video_watcher import EnhancedVideoWatcher
+
+    w = EnhancedVideoWatcher(str(tmp_path))
+    channel = os.path.join(str(tmp_path), "채널")
+    gone = os.path.join(channel, "채널_0827")
+    kept = os.path.join(channel, "채널_0828")
+    w._date_folders.update({gone: 1, kept: 1})
+
+    w.handler.on_deleted(DirDeletedEvent(gone))
+    assert list(w._date_folders) == [kept]
+
+    # Renaming the channel folder invalidates the date folders below it
+    w.handler.on_moved(DirMovedEvent(channel, os.path.join(str(tmp_path), "other")))
+    assert w._date_folders == {}